@@ -20,16 +20,30 @@ class Config:
         
         # 設定ファイルの読み込み
         self._load_config()
-        
+
         # 暗号化キーの設定
         self._setup_encryption()
-    
+
     def _load_config(self):
         """設定ファイルの読み込み"""
         if not os.path.exists(self.config_file):
             self._create_default_config()
-        
+
         self.config.read(self.config_file, encoding='utf-8')
+        self._rebuild_cache()
+
+    def _rebuild_cache(self):
+        """設定値のdictビューを再構築する
+
+        configparserのgetは呼び出しごとにセクション走査と補間を行うため、
+        読み込み時に (section, option)→文字列 の辞書へ展開しておき、
+        以降の参照をdictの1回引きで済ませる。set()は両方を更新する。
+        """
+        self._cache = {
+            (section, option): value
+            for section in self.config.sections()
+            for option, value in self.config.items(section)
+        }
     
     def _create_default_config(self):
         """デフォルト設定ファイルの作成"""
@@ -121,43 +135,45 @@ save_page_source = false
     
     def get(self, section, option, fallback=None):
         """設定値の取得"""
-        try:
-            value = self.config.get(section, option)
-            # 暗号化された値の場合は復号化
-            if value.endswith('_ENCRYPTED'):
-                return self.get_encrypted(section, option)
-            return value
-        except (configparser.NoSectionError, configparser.NoOptionError):
+        value = self._cache.get((section, option))
+        if value is None:
             return fallback
-    
+
+        # 暗号化された値の場合は復号化
+        if value.endswith('_ENCRYPTED'):
+            return self.get_encrypted(section, option)
+        return value
+
     def get_int(self, section, option, fallback=0):
         """整数値の取得"""
         try:
-            return self.config.getint(section, option)
-        except (configparser.NoSectionError, configparser.NoOptionError, ValueError):
+            return int(self._cache[(section, option)])
+        except (KeyError, ValueError):
             return fallback
-    
+
     def get_float(self, section, option, fallback=0.0):
         """浮動小数点値の取得"""
         try:
-            return self.config.getfloat(section, option)
-        except (configparser.NoSectionError, configparser.NoOptionError, ValueError):
+            return float(self._cache[(section, option)])
+        except (KeyError, ValueError):
             return fallback
-    
+
     def get_boolean(self, section, option, fallback=False):
         """真偽値の取得"""
         try:
-            return self.config.getboolean(section, option)
-        except (configparser.NoSectionError, configparser.NoOptionError, ValueError):
+            return configparser.ConfigParser.BOOLEAN_STATES[
+                self._cache[(section, option)].lower()]
+        except KeyError:
             return fallback
-    
+
     def set(self, section, option, value):
         """設定値の設定"""
         if not self.config.has_section(section):
             self.config.add_section(section)
-        
+
         self.config.set(section, option, str(value))
-    
+        self._cache[(section, option)] = str(value)
+
     def get_encrypted(self, section, option):
         """暗号化された値の取得"""
         encrypted_value = self.config.get(section, option)
@@ -179,6 +195,7 @@ save_page_source = false
         
         # 設定ファイルにはプレースホルダーを保存
         self.config.set(section, option, f"{option.upper()}_ENCRYPTED")
+        self._cache[(section, option)] = f"{option.upper()}_ENCRYPTED"
         self.save()
     
     def save(self):
@@ -3,6 +3,7 @@
 """
 import sqlite3
 import json
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -12,19 +13,47 @@ class Database:
     """データベース操作クラス"""
     
     def __init__(self, db_path='data/database.db'):
-        """初期化"""
-        self.db_path = Path(db_path)
+        """初期化
+
+        db_pathに':memory:'を指定するとディスクを介さない
+        インメモリDBになる（テスト用途）。
+        """
+        self.in_memory = db_path == ':memory:'
+        self.db_path = db_path if self.in_memory else Path(db_path)
         self.logger = setup_logger(__name__)
-        
+
         # データディレクトリの作成
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        
+        if not self.in_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 接続はセッション全体で1本を使い回す
+        # （呼び出しごとのopen/closeはインサートが多いと接続コストが支配的になる）
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+
+        if self.in_memory:
+            # インメモリDBは耐久性が不要なのでfsyncもジャーナルも省く
+            self.conn.execute('PRAGMA synchronous=OFF')
+            self.conn.execute('PRAGMA journal_mode=MEMORY')
+        else:
+            # WAL＋NORMALで書き込みスループットを改善
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        # 一時領域はメモリに置き、ページキャッシュは64MBに拡大
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA cache_size=-65536')
+
         # データベースの初期化
         self._initialize_database()
+
+    def close(self):
+        """データベース接続を閉じる"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
     
     def _initialize_database(self):
         """データベースの初期化"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             # メルカリ商品テーブル
@@ -172,7 +201,7 @@ class Database:
     
     def add_mercari_product(self, product_data: Dict[str, Any]) -> int:
         """メルカリ商品の追加"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             try:
@@ -205,9 +234,58 @@ class Database:
                 self.logger.error(f"メルカリ商品追加エラー: {e}")
                 raise
     
+    def add_mercari_products(self, products: List[Dict[str, Any]]) -> int:
+        """メルカリ商品の一括追加
+
+        1商品ずつのINSERTはステートメント単位の自動コミット（fsync）で
+        律速されるため、全行をexecutemanyで1トランザクションにまとめる。
+        """
+        rows = []
+        for product_data in products:
+            # image_urlsは呼び出し側でシリアライズ済みの文字列も受け付ける
+            image_urls = product_data.get('image_urls', [])
+            if not isinstance(image_urls, (str, type(None))):
+                image_urls = json.dumps(image_urls)
+
+            rows.append((
+                product_data.get('product_id'),
+                product_data.get('title'),
+                product_data.get('price'),
+                product_data.get('seller_name'),
+                product_data.get('condition_text'),
+                product_data.get('description'),
+                product_data.get('category'),
+                product_data.get('brand'),
+                product_data.get('shipping_method'),
+                product_data.get('shipping_cost'),
+                image_urls,
+                product_data.get('sold_date'),
+                product_data.get('view_count', 0),
+                product_data.get('like_count', 0)
+            ))
+
+        if not rows:
+            return 0
+
+        with self.conn as conn:
+            try:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO mercari_products
+                    (product_id, title, price, seller_name, condition_text, description,
+                     category, brand, shipping_method, shipping_cost, image_urls,
+                     sold_date, view_count, like_count, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', rows)
+
+            except sqlite3.Error as e:
+                self.logger.error(f"メルカリ商品一括追加エラー: {e}")
+                raise
+
+        return len(rows)
+
     def add_alibaba_product(self, product_data: Dict[str, Any]) -> int:
         """アリババ商品の追加"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             try:
@@ -237,7 +315,7 @@ class Database:
     
     def add_product_analysis(self, analysis_data: Dict[str, Any]) -> int:
         """商品分析の追加"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             try:
@@ -266,7 +344,7 @@ class Database:
     
     def get_profitable_products(self, min_profit_rate: float = 0.3, limit: int = 50) -> List[Dict]:
         """利益率の高い商品を取得"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -295,7 +373,7 @@ class Database:
     
     def add_keyword(self, keyword: str, category: str = None, priority: int = 1) -> int:
         """キーワードの追加"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             try:
@@ -310,9 +388,32 @@ class Database:
                 self.logger.error(f"キーワード追加エラー: {e}")
                 raise
     
+    def add_keywords(self, rows: List[tuple]) -> int:
+        """キーワードの一括追加
+
+        (keyword, category, priority) のタプル列を受け取り、
+        executemanyで1トランザクションにまとめて挿入する。
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+
+        with self.conn as conn:
+            try:
+                conn.executemany('''
+                    INSERT OR IGNORE INTO keywords (keyword, category, priority)
+                    VALUES (?, ?, ?)
+                ''', rows)
+
+            except sqlite3.Error as e:
+                self.logger.error(f"キーワード一括追加エラー: {e}")
+                raise
+
+        return len(rows)
+
     def update_keyword_stats(self, keyword: str, success_count: int, total_count: int):
         """キーワード統計の更新"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             success_rate = success_count / total_count if total_count > 0 else 0.0
@@ -327,7 +428,7 @@ class Database:
     
     def get_active_keywords(self, limit: int = None) -> List[Dict]:
         """アクティブなキーワード一覧を取得"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             sql = '''
@@ -344,10 +445,38 @@ class Database:
             columns = [description[0] for description in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
-    def log_performance(self, operation_name: str, execution_time: float, 
+    @contextmanager
+    def bulk_load(self):
+        """大量挿入時にインデックスを一時的に外すコンテキストマネージャ
+
+        インデックスは1行挿入するたびにB-treeを更新するため、
+        バルクロードでは先に削除し、投入完了後に一括で再構築する方が速い。
+
+        使用例:
+            with db.bulk_load():
+                db.add_mercari_products(rows)
+        """
+        indexes = self.conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type='index' AND sql IS NOT NULL"
+        ).fetchall()
+
+        with self.conn as conn:
+            for name, _ in indexes:
+                conn.execute(f'DROP INDEX {name}')
+
+        try:
+            yield
+        finally:
+            with self.conn as conn:
+                for _, sql in indexes:
+                    conn.execute(sql)
+            self.logger.info(f"インデックスを再構築しました: {len(indexes)}件")
+
+    def log_performance(self, operation_name: str, execution_time: float,
                        memory_usage: float = None, cpu_usage: float = None):
         """パフォーマンス情報の記録"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -360,7 +489,7 @@ class Database:
         """古いデータのクリーンアップ"""
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             # 古いシステムログを削除
@@ -380,6 +509,10 @@ class Database:
     
     def backup_database(self, backup_path: str = None):
         """データベースのバックアップ"""
+        if self.in_memory:
+            self.logger.warning("インメモリDBはバックアップ対象外です")
+            return None
+
         if backup_path is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_path = f"data/backup/database_backup_{timestamp}.db"
@@ -387,16 +520,22 @@ class Database:
         backup_file = Path(backup_path)
         backup_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # ファイルコピーによるバックアップ
-        import shutil
-        shutil.copy2(self.db_path, backup_file)
-        
+        # WALモードでは未チェックポイントのコミットが-walファイル側に
+        # 残るため、ファイルコピーではなくSQLiteのオンラインバックアップ
+        # APIで一貫したスナップショットを書き出す
+        dest_conn = sqlite3.connect(str(backup_file))
+        try:
+            with dest_conn:
+                self.conn.backup(dest_conn)
+        finally:
+            dest_conn.close()
+
         self.logger.info(f"データベースをバックアップしました: {backup_file}")
         return backup_file
     
     def get_statistics(self) -> Dict[str, Any]:
         """データベース統計情報の取得"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             
             stats = {}
@@ -3,6 +3,7 @@
 """
 import logging
 import logging.handlers
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -77,24 +78,26 @@ class PerformanceLogger:
         self.start_times = {}
     
     def start_timer(self, operation_name):
-        """タイマー開始"""
-        self.start_times[operation_name] = datetime.now()
+        """タイマー開始
+
+        datetime.nowはタイムゾーン解決とオブジェクト生成を伴うため、
+        計測には単調増加の整数ナノ秒カウンタを使う。
+        """
+        self.start_times[operation_name] = time.perf_counter_ns()
         self.logger.debug(f"開始: {operation_name}")
-    
+
     def end_timer(self, operation_name):
-        """タイマー終了"""
-        if operation_name in self.start_times:
-            start_time = self.start_times[operation_name]
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
-            self.logger.info(f"完了: {operation_name} - 実行時間: {duration:.2f}秒")
-            del self.start_times[operation_name]
-            
-            return duration
-        else:
+        """タイマー終了（経過秒数を返す）"""
+        start_ns = self.start_times.pop(operation_name, None)
+
+        if start_ns is None:
             self.logger.warning(f"タイマーが開始されていません: {operation_name}")
             return None
+
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+
+        self.logger.info(f"完了: {operation_name} - 実行時間: {duration:.2f}秒")
+        return duration
     
     def log_memory_usage(self):
         """メモリ使用量のログ"""
@@ -5,22 +5,41 @@ import re
 import time
 import random
 import hashlib
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
 import requests
 from pathlib import Path
 
+# ベクトル演算はnumpyがある場合のみ（未導入でも1件ずつの処理で動作する）
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 正規表現はモジュール読み込み時に1回だけコンパイルする
+# （文字列パターンのままだとreの内部キャッシュ参照が毎呼び出しに入る）
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_NUMBER_RE = re.compile(r'[0-9,]+')
+_PRICE_PATTERNS = (
+    re.compile(r'[￥¥]?\s*([0-9,]+)\s*円?'),
+    re.compile(r'([0-9,]+)\s*[￥¥円]'),
+    re.compile(r'([0-9,]+)')
+)
+_WORD_RE = re.compile(r'[一-龯ァ-ヶa-zA-Z0-9]+')
+
 def clean_text(text: str) -> str:
     """テキストのクリーニング"""
     if not text:
         return ""
     
     # HTMLタグの除去
-    text = re.sub(r'<[^>]+>', '', text)
-    
+    text = _HTML_TAG_RE.sub('', text)
+
     # 余分な空白の除去
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WS_RE.sub(' ', text).strip()
     
     # 特殊文字の正規化
     text = text.replace('\u3000', ' ')  # 全角スペース
@@ -34,7 +53,7 @@ def extract_numbers(text: str) -> List[int]:
         return []
     
     # カンマ区切りの数字も対応
-    numbers = re.findall(r'[0-9,]+', text)
+    numbers = _NUMBER_RE.findall(text)
     result = []
     
     for num_str in numbers:
@@ -53,14 +72,8 @@ def extract_price(text: str) -> Optional[int]:
         return None
     
     # 「￥1,000」「1000円」「1,000」等のパターンに対応
-    patterns = [
-        r'[￥¥]?\s*([0-9,]+)\s*円?',
-        r'([0-9,]+)\s*[￥¥円]',
-        r'([0-9,]+)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _PRICE_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 price = int(match.group(1).replace(',', ''))
@@ -101,6 +114,70 @@ def calculate_profit(selling_price: int, cost_price: int,
         'roi': roi
     }
 
+def calculate_profits(selling_prices, cost_prices,
+                      shipping_costs=300, mercari_fee_rate: float = 0.10) -> Dict[str, Any]:
+    """利益計算の一括版
+
+    calculate_profitと同じ計算を商品リスト全体へNumPyのベクトル演算で
+    一度に適用する。戻り値は同じキーで、値が配列になる。
+    numpy未導入の環境では1件ずつの計算にフォールバックする。
+    """
+    if np is None:
+        if not hasattr(shipping_costs, '__len__'):
+            shipping_costs = [shipping_costs] * len(selling_prices)
+        results = [
+            calculate_profit(int(sp), int(cp), int(ship), mercari_fee_rate)
+            for sp, cp, ship in zip(selling_prices, cost_prices, shipping_costs)
+        ]
+        keys = ('selling_price', 'cost_price', 'shipping_cost', 'mercari_fee',
+                'total_cost', 'profit', 'profit_rate', 'roi')
+        return {key: [r[key] for r in results] for key in keys}
+
+    sp = np.asarray(selling_prices, dtype=np.int64)
+    cp = np.asarray(cost_prices, dtype=np.int64)
+    ship = np.broadcast_to(
+        np.asarray(shipping_costs, dtype=np.int64), sp.shape)
+
+    mercari_fee = (sp * mercari_fee_rate).astype(np.int64)
+    total_cost = cp + ship + mercari_fee
+    profit = sp - total_cost
+
+    # ゼロ除算は単品版と同じく0.0に落とす
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_rate = np.where(sp > 0, profit / np.where(sp > 0, sp, 1), 0.0)
+        roi = np.where(cp > 0, profit / np.where(cp > 0, cp, 1), 0.0)
+
+    return {
+        'selling_price': sp,
+        'cost_price': cp,
+        'shipping_cost': ship,
+        'mercari_fee': mercari_fee,
+        'total_cost': total_cost,
+        'profit': profit,
+        'profit_rate': profit_rate,
+        'roi': roi
+    }
+
+def extract_prices(texts) -> List[Optional[int]]:
+    """価格文字列の一括抽出
+
+    pandasの文字列ベクトル演算で最初の数字列を取り出して変換する。
+    extract_priceと同じ妥当範囲（10円〜1,000,000円）の外はNoneになる。
+    pandas未導入の環境では1件ずつの抽出にフォールバックする。
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return [extract_price(text) for text in texts]
+
+    series = pd.Series(texts, dtype='object').fillna('')
+    digits = series.str.extract(r'([0-9,]+)', expand=False)
+    numbers = pd.to_numeric(
+        digits.str.replace(',', '', regex=False), errors='coerce')
+    valid = numbers.where((numbers >= 10) & (numbers <= 1000000))
+
+    return [int(value) if pd.notna(value) else None for value in valid]
+
 def generate_product_id(title: str, price: int, seller: str = "") -> str:
     """商品IDの生成"""
     # タイトル、価格、販売者を組み合わせてハッシュ化
@@ -145,8 +222,13 @@ def random_delay(min_seconds: float = 1.0, max_seconds: float = 3.0):
     delay = random.uniform(min_seconds, max_seconds)
     time.sleep(delay)
 
+@lru_cache(maxsize=1024)
 def format_currency(amount: int, currency: str = "JPY") -> str:
-    """通貨フォーマット"""
+    """通貨フォーマット
+
+    純粋関数かつCSV出力や画面表示で同じ価格が繰り返し渡されるため、
+    フォーマット結果をメモ化する。
+    """
     if currency == "JPY":
         return f"¥{amount:,}"
     elif currency == "CNY":
@@ -235,7 +317,7 @@ def extract_keywords_from_title(title: str, max_keywords: int = 5) -> List[str]:
     }
     
     # 単語分割（簡易版）
-    words = re.findall(r'[一-龯ァ-ヶa-zA-Z0-9]+', title)
+    words = _WORD_RE.findall(title)
     
     # ストップワードを除外し、長さでフィルタリング
     keywords = []
@@ -17,6 +17,13 @@ sys.path.insert(0, str(project_root))
 from modules.next_scraper import NextDataScraper
 from modules.image_filter import ImageFilter
 
+# CSV出力の列定義。NextDataScraper._format_itemの統一フォーマット＋
+# NG/OKワード判定で付くpriorityフラグで固定し、行ごとのキー照合を省く
+_CSV_FIELDNAMES = (
+    'id', 'title', 'price', 'thumb_url', 'url', 'status',
+    'seller', 'likes', 'condition', 'shipping', 'created_at', 'priority'
+)
+
 class MercariMonitor:
     """メルカリ監視システム"""
     
@@ -34,6 +41,12 @@ class MercariMonitor:
         self.image_filter = ImageFilter(
             config=self.config['image_filter']
         ) if self.config['image_filter']['enabled'] else None
+
+        # NG/OKワードはチェックのたびに小文字化し直さず、起動時に1回だけ正規化
+        self._ng_words = tuple(
+            w.lower() for w in self.config['image_filter'].get('ng_words', []))
+        self._ok_words = tuple(
+            w.lower() for w in self.config['image_filter'].get('ok_words', []))
         
         # 結果保存ディレクトリ
         self.results_dir = Path("results")
@@ -72,17 +85,29 @@ class MercariMonitor:
                 print(f"\n--- チェック #{check_count} ({datetime.now().strftime('%H:%M:%S')}) ---")
                 
                 all_items = []
-                
+
                 # 各キーワードで検索
-                for keyword in keywords:
-                    print(f"🔍 検索: {keyword}")
-                    
-                    items = self.scraper.fetch_items(
-                        keyword=keyword,
+                # （ネットワーク待ちが支配的なため、複数キーワードは並行取得）
+                max_items = self.config['monitor']['max_items_per_check']
+                if len(keywords) > 1:
+                    items_by_keyword = self.scraper.fetch_items_many(
+                        keywords=keywords,
                         conditions=conditions,
-                        max_items=self.config['monitor']['max_items_per_check']
+                        max_items=max_items
                     )
-                    
+                else:
+                    items_by_keyword = {
+                        keywords[0]: self.scraper.fetch_items(
+                            keyword=keywords[0],
+                            conditions=conditions,
+                            max_items=max_items
+                        )
+                    }
+
+                for keyword in keywords:
+                    print(f"🔍 検索: {keyword}")
+                    items = items_by_keyword.get(keyword, [])
+
                     if items:
                         print(f"  → {len(items)}件の新商品")
                         
@@ -131,25 +156,20 @@ class MercariMonitor:
     
     def _filter_ng_words(self, items):
         """NGワードフィルタリング"""
-        ng_words = self.config['image_filter'].get('ng_words', [])
-        ok_words = self.config['image_filter'].get('ok_words', [])
-        
         filtered = []
         for item in items:
             title = item.get('title', '').lower()
-            
+
             # NGワードチェック
-            has_ng = any(ng.lower() in title for ng in ng_words)
-            if has_ng:
+            if any(ng in title for ng in self._ng_words):
                 continue
-            
+
             # OKワード優先
-            has_ok = any(ok.lower() in title for ok in ok_words)
-            if has_ok:
+            if any(ok in title for ok in self._ok_words):
                 item['priority'] = True
-            
+
             filtered.append(item)
-        
+
         return filtered
     
     def _notify(self, items):
@@ -263,22 +283,47 @@ class MercariMonitor:
         """結果保存"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
+        csv_path = None
+
         # CSV保存
-        if self.config['storage']['csv_export']:
+        if self.config['storage']['csv_export'] and items:
             import csv
             csv_path = self.results_dir / f"items_{timestamp}.csv"
-            with open(csv_path, 'w', newline='', encoding='utf-8-sig') as f:
-                if items:
-                    writer = csv.DictWriter(f, fieldnames=items[0].keys())
-                    writer.writeheader()
-                    writer.writerows(items)
+            # 1MBバッファで行ごとのwriteシステムコールをまとめ、
+            # フラッシュはclose時の1回に任せる
+            with open(csv_path, 'w', newline='', encoding='utf-8-sig',
+                      buffering=1 << 20) as f:
+                # スキーマが固定なのでDictWriterのキー照合を挟まず、
+                # 列順どおりのリストをcsv.writerへ渡す
+                writer = csv.writer(f)
+                writer.writerow(_CSV_FIELDNAMES)
+                writer.writerows(
+                    [item.get(field, '') for field in _CSV_FIELDNAMES]
+                    for item in items
+                )
         
         # JSON保存
+        # 商品リスト本体はCSV側が持つため、CSVを書いた場合は同じデータを
+        # 二重にシリアライズせずメタデータとCSVへの参照だけを書く。
+        # CSV出力が無効ならJSONが唯一の保存先なので商品リストも含める
         if self.config['storage']['json_export']:
-            import json
             json_path = self.results_dir / f"items_{timestamp}.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(items, f, ensure_ascii=False, indent=2)
+            save_data = {
+                'timestamp': timestamp,
+                'count': len(items),
+                'csv_path': str(csv_path) if csv_path else None,
+            }
+            if csv_path is None:
+                save_data['items'] = items
+            try:
+                # orjsonはbytesを直接返すため、エンコードも含めて1回で書き出せる
+                import orjson
+                json_path.write_bytes(
+                    orjson.dumps(save_data, option=orjson.OPT_INDENT_2))
+            except ImportError:
+                import json
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(save_data, f, ensure_ascii=False, indent=2)
     
     def _show_summary(self, check_count, total_found):
         """終了時のサマリー表示"""
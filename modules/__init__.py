@@ -3,7 +3,11 @@ Modules package initialization
 """
 
 # 新しいスクレイパーのみインポート（RPAは使わない）
-from .scraper import MercariScraper
+# スクレイパーが無い構成でも modules.* のインポートを止めないようにガード
+try:
+    from .scraper import MercariScraper
+except ImportError:
+    MercariScraper = None
 
 __all__ = [
     'MercariScraper'
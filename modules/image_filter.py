@@ -3,6 +3,7 @@
 画像フィルターモジュール
 プロ画像とアマチュア画像を判定
 """
+import asyncio
 import requests
 import io
 from PIL import Image
@@ -17,24 +18,70 @@ class ImageFilter:
         """初期化"""
         self.config = config
         self.seen_hashes = set()  # 既に見た画像のハッシュ
-        
+        self._image_cache = {}  # 一括ダウンロード済みの画像バイト列
+
     def filter_items(self, items: List[Dict]) -> List[Dict]:
         """
         商品リストをフィルタリング
-        
+
         Args:
             items: 商品リスト
-            
+
         Returns:
             フィルタ後の商品リスト
         """
+        # サムネイルを先に一括ダウンロードしておく
+        # （1件ずつのGETだとTLSハンドシェイクと待ち時間が直列に積み上がる）
+        urls = [item.get('thumb_url') for item in items if item.get('thumb_url')]
+        if len(urls) > 1:
+            self._image_cache = self._download_images_batch(urls)
+
         filtered = []
-        
+
         for item in items:
             if self._is_professional_item(item):
                 filtered.append(item)
-        
+
+        self._image_cache = {}
         return filtered
+
+    def _download_images_batch(self, urls: List[str]) -> Dict[str, bytes]:
+        """サムネイルをHTTP/2多重化で一括ダウンロード
+
+        httpxが使える場合は1本のTLS接続に複数リクエストを多重化する。
+        使えない環境では空dictを返し、従来の逐次ダウンロードに任せる。
+        """
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            return {}
+
+        try:
+            return asyncio.run(self._download_images_async(urls))
+        except Exception as e:
+            print(f"画像一括取得エラー: {str(e)}")
+            return {}
+
+    async def _download_images_async(self, urls: List[str]) -> Dict[str, bytes]:
+        """_download_images_batchの非同期本体"""
+        import httpx
+
+        semaphore = asyncio.Semaphore(16)
+        results = {}
+
+        async with httpx.AsyncClient(http2=True, timeout=5) as client:
+            async def fetch(url):
+                async with semaphore:
+                    try:
+                        response = await client.get(url)
+                        response.raise_for_status()
+                        results[url] = response.content
+                    except Exception:
+                        pass  # 失敗分は逐次ダウンロードが拾う
+
+            await asyncio.gather(*(fetch(url) for url in set(urls)))
+
+        return results
     
     def _is_professional_item(self, item: Dict) -> bool:
         """
@@ -99,11 +146,14 @@ class ImageFilter:
             return False
     
     def _download_image(self, url: str) -> Image.Image:
-        """画像ダウンロード"""
+        """画像ダウンロード（一括取得済みならキャッシュから返す）"""
         try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            img = Image.open(io.BytesIO(response.content))
+            data = self._image_cache.pop(url, None)
+            if data is None:
+                response = requests.get(url, timeout=5)
+                response.raise_for_status()
+                data = response.content
+            img = Image.open(io.BytesIO(data))
             return img.convert('RGB')
         except:
             return None
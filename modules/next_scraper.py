@@ -3,25 +3,124 @@
 NextDataScraperモジュール
 メルカリの__NEXT_DATA__から商品情報を取得
 """
+import asyncio
 import json
 import time
 import sqlite3
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# HTMLの検索ページが内部で叩いているJSON検索API
+API_SEARCH_URL = "https://api.mercari.jp/v2/entities:search"
+
+# conditions → APIフィールドへの対応表
+_API_STATUS_MAP = {
+    'on_sale': 'STATUS_ON_SALE',
+    'sold_out': 'STATUS_SOLD_OUT',
+}
+
+# __NEXT_DATA__抽出ではscriptタグしか見ないため、
+# ヘッダー・ナビ・本文のツリー構築を丸ごとスキップする
+_SCRIPT_STRAINER = SoupStrainer('script')
+
+class _TokenBucket:
+    """トークンバケット式レートリミッター
+
+    固定スリープと違い、平均リクエストレートを守りながらバーストを許す。
+    処理や通信に時間がかかった分だけトークンが補充されるため、
+    その場合の追加待ちはゼロになる。
+    """
+
+    def __init__(self, rate: float = 6.0, period: float = 10.0, burst: int = 3):
+        self._interval = period / rate  # 1トークンの補充間隔（秒）
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def acquire(self) -> float:
+        """1トークン消費し、必要な待ち時間（秒）を返す"""
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity,
+            self._tokens + (now - self._updated) / self._interval
+        )
+        self._updated = now
+
+        self._tokens -= 1.0
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens * self._interval
 
 class NextDataScraper:
     """メルカリの__NEXT_DATA__から商品情報を取得（名前を短く変更）"""
     
-    def __init__(self, db_path: str = "mercari.db"):
-        """初期化"""
-        self.session = requests.Session()
+    def __init__(self, db_path: str = "mercari.db", use_cache: bool = False):
+        """初期化
+
+        Args:
+            db_path: 商品管理用SQLiteのパス
+            use_cache: Trueの場合、取得ページをディスクにキャッシュする。
+                同一URLの再取得（リトライ、開発中の再実行）がネットワークを
+                経由せず返るようになる。新着監視では鮮度が落ちるため
+                デフォルトは無効。
+        """
+        self.session = None
+        if use_cache:
+            try:
+                import requests_cache
+                self.session = requests_cache.CachedSession(
+                    'mercari_cache',
+                    backend='sqlite',
+                    expire_after=1800,
+                    allowable_codes=(200,),
+                    stale_if_error=True
+                )
+                print("💾 ページキャッシュ有効 (mercari_cache.sqlite)")
+            except ImportError:
+                print("⚠️ requests-cacheが未インストールのためキャッシュなしで動作")
+
+        if self.session is None:
+            self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+
+        # 接続プールを広げてkeep-alive再利用を効かせ、
+        # 一時的なサーバーエラーはアダプター側でリトライする
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # C実装のlxmlパーサーを優先し、無い環境では標準パーサーに退避
+        try:
+            import lxml  # noqa: F401
+            self._parser = 'lxml'
+        except ImportError:
+            self._parser = 'html.parser'
         
+        # リクエストレート制御（平均6req/10秒、バースト3まで）
+        self._bucket = _TokenBucket()
+
         # データベース初期化
         self.db_path = db_path
         self._init_db()
@@ -71,17 +170,33 @@ class NextDataScraper:
         Returns:
             商品リスト
         """
+        # まずJSON検索APIを試す（HTMLの約1/20のバイト数でパース不要）
+        try:
+            items = self._search_api(keyword, conditions or {}, max_items)
+            if items:
+                print(f"✅ {len(items)}件の商品データを取得 (API)")
+                new_items = self._filter_new_items(items)
+                print(f"🆕 新規商品: {len(new_items)}件")
+                return new_items[:max_items]
+        except Exception as e:
+            print(f"⚠️ API検索失敗、HTML取得にフォールバック: {str(e)}")
+
         # URL構築
         url = self._build_url(keyword, conditions or {})
         print(f"🔍 検索URL: {url}")
-        
+
         try:
-            # ページ取得
+            # ページ取得（レートリミッターで平均レートを維持）
+            wait = self._bucket.acquire()
+            if wait > 0:
+                time.sleep(wait)
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             # __NEXT_DATA__を抽出
-            items = self._extract_next_data(response.text)
+            # response.text はchardetによるエンコーディング推定を挟むため、
+            # バイト列のままパーサーに渡してlxml側で判定させる
+            items = self._extract_next_data(response.content)
             
             if items:
                 print(f"✅ {len(items)}件の商品データを取得")
@@ -97,42 +212,155 @@ class NextDataScraper:
             print(f"❌ エラー: {str(e)}")
             return []
     
+    def _search_api(self, keyword: str, conditions: Dict, max_items: int) -> List[Dict]:
+        """JSON検索APIで商品を取得
+
+        検索ページのHTML（数百KB）を取得してパースする代わりに、
+        ページが内部で呼んでいるAPIへ直接POSTして構造化JSONを読む。
+        失敗時は呼び出し側がHTML方式にフォールバックする。
+        """
+        payload = {
+            'userId': '',
+            'pageSize': max_items,
+            'searchSessionId': '',
+            'searchCondition': {
+                'keyword': keyword,
+                'sort': 'SORT_CREATED_TIME',
+                'order': 'ORDER_DESC',
+            },
+        }
+
+        status = _API_STATUS_MAP.get(conditions.get('status'))
+        if status:
+            payload['searchCondition']['status'] = [status]
+        if conditions.get('item_condition'):
+            payload['searchCondition']['itemConditionId'] = [conditions['item_condition']]
+        if conditions.get('price_min'):
+            payload['searchCondition']['priceMin'] = conditions['price_min']
+        if conditions.get('price_max'):
+            payload['searchCondition']['priceMax'] = conditions['price_max']
+
+        wait = self._bucket.acquire()
+        if wait > 0:
+            time.sleep(wait)
+        response = self.session.post(API_SEARCH_URL, json=payload, timeout=10)
+        response.raise_for_status()
+
+        if orjson is not None:
+            data = orjson.loads(response.content)
+        else:
+            data = json.loads(response.content)
+
+        return [self._format_item(item) for item in data.get('items', [])]
+
+    def fetch_items_many(self, keywords: List[str], conditions: Dict = None,
+                         max_items: int = 30, max_concurrency: int = 8) -> Dict[str, List[Dict]]:
+        """複数キーワードの検索ページを並行取得
+
+        取得はほぼ全てネットワーク待ちのため、aiohttpで同時に投げる
+        ことでキーワード数分の直列待ちを解消する。
+
+        Args:
+            keywords: 検索キーワードのリスト
+            conditions: 検索条件
+            max_items: キーワードあたりの最大取得件数
+            max_concurrency: 同時リクエスト数の上限
+
+        Returns:
+            キーワード → 新規商品リスト の辞書
+        """
+        return asyncio.run(self._fetch_items_many(
+            keywords, conditions or {}, max_items, max_concurrency))
+
+    async def _fetch_items_many(self, keywords: List[str], conditions: Dict,
+                                max_items: int, max_concurrency: int) -> Dict[str, List[Dict]]:
+        """fetch_items_manyの非同期本体"""
+        import aiohttp
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=10)
+
+        async def fetch_one(keyword: str) -> List[Dict]:
+            url = self._build_url(keyword, conditions)
+            async with semaphore:
+                wait = self._bucket.acquire()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    html = await response.read()
+            items = self._extract_next_data(html)
+            if not items:
+                return []
+            return self._filter_new_items(items)[:max_items]
+
+        async with aiohttp.ClientSession(
+                headers=dict(self.session.headers), timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(fetch_one(keyword) for keyword in keywords),
+                return_exceptions=True)
+
+        items_by_keyword = {}
+        for keyword, result in zip(keywords, results):
+            if isinstance(result, Exception):
+                print(f"❌ エラー ({keyword}): {result}")
+                items_by_keyword[keyword] = []
+            else:
+                items_by_keyword[keyword] = result
+
+        return items_by_keyword
+
     def _build_url(self, keyword: str, conditions: Dict) -> str:
-        """検索URL構築"""
+        """検索URL構築
+
+        ページネーションやリトライで同じ (keyword, conditions) の組み合わせが
+        何度も来るため、条件をタプルに正規化してキャッシュ済みの実装に委譲する。
+        """
+        key = tuple(sorted(
+            (k, tuple(v) if isinstance(v, list) else v)
+            for k, v in conditions.items()
+        ))
+        return self._build_url_cached(keyword, key)
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _build_url_cached(keyword: str, condition_items: Tuple) -> str:
+        """_build_urlのキャッシュ対象本体
+
+        パラメータは (key, value) タプルのリストで集め、クエリ文字列化と
+        パーセントエンコードはurlencodeに一括で任せる。
+        """
+        conditions = dict(condition_items)
         base = "https://jp.mercari.com/search"
-        params = [f"keyword={keyword}"]
-        
+        params = [('keyword', keyword)]
+
         # 販売状態
-        if conditions.get('status') == 'on_sale':
-            params.append("status=on_sale")
-        elif conditions.get('status') == 'sold_out':
-            params.append("status=sold_out")
-        
+        if conditions.get('status') in ('on_sale', 'sold_out'):
+            params.append(('status', conditions['status']))
+
         # 商品の状態（1=新品）
         if conditions.get('item_condition'):
-            params.append(f"item_condition_id={conditions['item_condition']}")
-        
+            params.append(('item_condition_id', conditions['item_condition']))
+
         # 価格帯
         if conditions.get('price_min'):
-            params.append(f"price_min={conditions['price_min']}")
+            params.append(('price_min', conditions['price_min']))
         if conditions.get('price_max'):
-            params.append(f"price_max={conditions['price_max']}")
-        
+            params.append(('price_max', conditions['price_max']))
+
         # 配送料（2=送料込み）
         if conditions.get('shipping_payer'):
-            params.append("shipping_payer_id=2")
-        
+            params.append(('shipping_payer_id', 2))
+
         # ソート
-        sort = conditions.get('sort', 'created_time')
-        order = conditions.get('order', 'desc')
-        params.append(f"sort={sort}")
-        params.append(f"order={order}")
-        
-        return f"{base}?{'&'.join(params)}"
+        params.append(('sort', conditions.get('sort', 'created_time')))
+        params.append(('order', conditions.get('order', 'desc')))
+
+        return f"{base}?{urlencode(params, doseq=True)}"
     
-    def _extract_next_data(self, html: str) -> List[Dict]:
-        """HTMLから__NEXT_DATA__を抽出"""
-        soup = BeautifulSoup(html, 'lxml')
+    def _extract_next_data(self, html) -> List[Dict]:
+        """HTMLから__NEXT_DATA__を抽出（str/bytesどちらも受け付ける）"""
+        soup = BeautifulSoup(html, self._parser, parse_only=_SCRIPT_STRAINER)
         
         # __NEXT_DATA__スクリプトタグを探す
         script = soup.find('script', {'id': '__NEXT_DATA__', 'type': 'application/json'})
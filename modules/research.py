@@ -4,184 +4,664 @@
 import time
 import csv
 import json
+import random
 import re
+import threading
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+from itertools import chain
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlparse
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
-import requests
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from core.logger import setup_logger
-from core.rpa import MercariRPA
-from core.error_handler import MercariErrorHandler, retry_on_error, RetryConfig
+
+# エラーハンドリング基盤は未配備の環境がある（core/__init__.pyでも
+# コメントアウト中）。core.rpaと同様に必須依存にせず、無い場合は
+# リトライなしの代替に差し替えてCSV/DB保存だけの利用でも読み込める
+# ようにする
+try:
+    from core.error_handler import MercariErrorHandler, retry_on_error, RetryConfig
+except ImportError:
+    MercariErrorHandler = None
+    RetryConfig = None
+
+    def retry_on_error(*args, **kwargs):
+        """core.error_handler不在時の代替（デコレート対象をそのまま返す）"""
+        def decorator(func):
+            return func
+        return decorator
+
 from core.utils import (
     extract_price, clean_text, generate_product_id,
-    extract_keywords_from_title, format_currency
+    extract_keywords_from_title
 )
 
+@dataclass
+class ProductBatch:
+    """商品リストのカラム指向（SoA）表現
+
+    dict の行リストは1行ごとに小さなアロケーションとハッシュ探索が
+    発生する。重複除去やDB保存のような列単位の処理は、並列リストと
+    コンパクトな数値配列に載せ替えた方がメモリ局所性が良い。
+    """
+    urls: List[Optional[str]] = field(default_factory=list)
+    product_ids: List[Optional[str]] = field(default_factory=list)
+    titles: List[Optional[str]] = field(default_factory=list)
+    prices: array = field(default_factory=lambda: array('q'))
+    image_urls: List[Optional[str]] = field(default_factory=list)
+    conditions: List[Optional[str]] = field(default_factory=list)
+    like_counts: array = field(default_factory=lambda: array('i'))
+    is_sold: array = field(default_factory=lambda: array('b'))
+
+    @classmethod
+    def from_products(cls, products: List[Dict[str, Any]]) -> 'ProductBatch':
+        """行指向のdictリストから列指向バッチを構築"""
+        batch = cls()
+        for product in products:
+            batch.urls.append(product.get('url'))
+            batch.product_ids.append(product.get('product_id'))
+            batch.titles.append(product.get('title'))
+            batch.prices.append(product.get('price') or 0)
+            batch.image_urls.append(product.get('image_url'))
+            batch.conditions.append(product.get('condition'))
+            batch.like_counts.append(product.get('like_count') or 0)
+            batch.is_sold.append(1 if product.get('is_sold') else 0)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def iter_db_rows(self):
+        """データベース保存用の行を列のzipで生成"""
+        for product_id, title, price, condition, image_url, like_count in zip(
+                self.product_ids, self.titles, self.prices,
+                self.conditions, self.image_urls, self.like_counts):
+            yield {
+                'product_id': product_id,
+                'title': title,
+                'price': price,
+                'condition_text': condition,
+                'image_url': image_url,
+                'like_count': like_count,
+            }
+
+# メルカリの要素セレクター（2024年版）
+# セレクターのリスト生成をプロセスで1回にするためモジュールレベルに保持
+_SELECTORS = {
+    # 商品リスト
+    'product_list': (
+        'div[data-testid="item-list"] > ul > li',
+        'div[data-testid="item-cell"]',
+        'ul[data-testid*="item"] li',
+        '.items-box-content',
+        'mer-item-thumbnail',
+    ),
+
+    # 商品リンク
+    'product_link': (
+        'a[data-testid="item-link"]',
+        'mer-item-thumbnail a',
+        'a[href*="/item/"]',
+        '.item-link',
+    ),
+
+    # 商品タイトル
+    'product_title': (
+        'mer-item-thumbnail .item-name',
+        '[data-testid="item-name"]',
+        'h3.item-name',
+        '.item-name span',
+        'figcaption span',
+    ),
+
+    # 商品価格
+    'product_price': (
+        'mer-item-thumbnail .item-price',
+        '[data-testid="item-price"]',
+        '.price',
+        '.item-price span',
+        'span[class*="price"]',
+    ),
+
+    # 商品画像
+    'product_image': (
+        'mer-item-thumbnail img',
+        '[data-testid="item-image"]',
+        '.item-photo img',
+        'figure img',
+    ),
+
+    # 売り切れバッジ
+    'sold_badge': (
+        '.item-sold-out-badge',
+        '[data-testid="sold-badge"]',
+        '.sold-out',
+        'span:contains("SOLD")',
+    ),
+
+    # 商品状態
+    'condition': (
+        '.item-condition',
+        '[data-testid="condition"]',
+        '.condition-label',
+    ),
+
+    # いいね数
+    'like_count': (
+        '[data-testid="like-count"]',
+        '.like-count',
+        '.heart-count span',
+    ),
+}
+
+# ホットループ内で使う正規表現はインポート時に1回だけコンパイル
+_DIGIT_RE = re.compile(r'\d+')
+_PRICE_RE = re.compile(r'\d[\d,]*')
+
+def _fast_price(text: str) -> Optional[int]:
+    """価格専用ノードのテキストから価格を取り出す軽量版
+
+    utils.extract_price は通貨記号の除去と複数パターンの試行を行うが、
+    価格セレクターにヒットした要素のテキストは数字列そのものなので、
+    1回の正規表現検索とカンマ除去だけで十分。
+    """
+    match = _PRICE_RE.search(text)
+    if not match:
+        return None
+    return int(match.group().replace(',', ''))
+
+# 売り切れ判定のテキストフォールバック。トークンごとの部分文字列検索
+# ではなく、1回の走査で判定できる選択肢正規表現にまとめる
+_SOLD_RE = re.compile(r'SOLD OUT|SOLD|sold|売り切れ|売切れ')
+
+# Next.jsページに埋め込まれた商品JSON。DOMを組み立てずに
+# ページソースの文字列走査だけで取り出す
+_NEXT_DATA_RE = re.compile(
+    r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>',
+    re.DOTALL
+)
+
+# product_list セレクター群をXPathのユニオンに畳んだもの。
+# セレクターごとにDOMを再走査する代わりに1回の走査で全候補を拾う。
+_PRODUCT_XPATH_UNION = (
+    '//div[@data-testid="item-list"]/ul/li'
+    ' | //div[@data-testid="item-cell"]'
+    ' | //ul[contains(@data-testid, "item")]//li'
+    ' | //*[contains(concat(" ", normalize-space(@class), " "), " items-box-content ")]'
+    ' | //mer-item-thumbnail'
+)
+_product_xpath = None  # lxml.etree.XPathとして初回使用時にコンパイル
+
+# 商品画像抽出用のXPathユニオン。属性値を直接返すため、
+# 要素オブジェクトのラップ生成を挟まずに文字列が得られる
+_IMG_XPATH_UNION = (
+    './/mer-item-thumbnail//img/@data-src'
+    ' | .//mer-item-thumbnail//img/@src'
+    ' | .//*[@data-testid="item-image"]//img/@src'
+    ' | .//*[@data-testid="item-image"]/@src'
+    ' | .//*[contains(concat(" ", normalize-space(@class), " "), " item-photo ")]//img/@src'
+    ' | .//figure//img/@src'
+)
+_img_xpath = None  # lxml.etree.XPathとして初回使用時にコンパイル
+
+# _SELECTORS全体のCSSSelectorコンパイル結果（初回フォールバック時に構築）
+_compiled_selectors = None
+
+def _product_id_from_url(url: Optional[str]) -> Optional[str]:
+    """商品URLからメルカリの商品IDを取り出す
+
+    partitionはタプルを返すため、splitのように一時リストを確保しない。
+    '/item/' を含まないURLでは None を返し、呼び出し側がハッシュ生成に
+    フォールバックする。
+    """
+    if not url:
+        return None
+    _, sep, rest = url.partition('/item/')
+    if not sep:
+        return None
+    product_id, _, _ = rest.partition('?')
+    product_id, _, _ = product_id.partition('/')
+    return product_id or None
+
+def _get_compiled_selectors():
+    """セレクター文字列をCSSSelectorへ1回だけコンパイルして返す
+
+    cssselect はセレクター文字列を呼び出しのたびにXPathへ変換するため、
+    フォールバック抽出のホットパスではコンパイル済みオブジェクトを使う。
+    :contains() などcssselect非対応のものは None で埋めてスキップさせる。
+    """
+    global _compiled_selectors
+    if _compiled_selectors is None:
+        from lxml.cssselect import CSSSelector
+        compiled = {}
+        for fieldname, selectors in _SELECTORS.items():
+            entries = []
+            for selector in selectors:
+                try:
+                    entries.append(CSSSelector(selector))
+                except Exception:
+                    entries.append(None)
+            compiled[fieldname] = tuple(entries)
+        _compiled_selectors = compiled
+    return _compiled_selectors
+
 class ProductExtractor:
     """商品データ抽出クラス"""
-    
+
     def __init__(self):
         """初期化"""
         self.logger = setup_logger(__name__ + '.ProductExtractor')
-        
-        # メルカリの要素セレクター（2024年版）
-        self.selectors = {
-            # 商品リスト
-            'product_list': [
-                'div[data-testid="item-list"] > ul > li',
-                'div[data-testid="item-cell"]',
-                'ul[data-testid*="item"] li',
-                '.items-box-content',
-                'mer-item-thumbnail'
-            ],
-            
-            # 商品リンク
-            'product_link': [
-                'a[data-testid="item-link"]',
-                'mer-item-thumbnail a',
-                'a[href*="/item/"]',
-                '.item-link'
-            ],
-            
-            # 商品タイトル
-            'product_title': [
-                'mer-item-thumbnail .item-name',
-                '[data-testid="item-name"]',
-                'h3.item-name',
-                '.item-name span',
-                'figcaption span'
-            ],
-            
-            # 商品価格
-            'product_price': [
-                'mer-item-thumbnail .item-price',
-                '[data-testid="item-price"]',
-                '.price',
-                '.item-price span',
-                'span[class*="price"]'
-            ],
-            
-            # 商品画像
-            'product_image': [
-                'mer-item-thumbnail img',
-                '[data-testid="item-image"]',
-                '.item-photo img',
-                'figure img'
-            ],
-            
-            # 売り切れバッジ
-            'sold_badge': [
-                '.item-sold-out-badge',
-                '[data-testid="sold-badge"]',
-                '.sold-out',
-                'span:contains("SOLD")'
-            ],
-            
-            # 商品状態
-            'condition': [
-                '.item-condition',
-                '[data-testid="condition"]',
-                '.condition-label'
-            ],
-            
-            # いいね数
-            'like_count': [
-                '[data-testid="like-count"]',
-                '.like-count',
-                '.heart-count span'
-            ]
-        }
-    
-    def extract_products_from_page(self, driver) -> List[Dict[str, Any]]:
-        """現在のページから商品データを抽出"""
+
+        # レイアウト特化抽出器（初回の抽出成功後に構築される）
+        self._specialized = None
+        self._selector_hits = {}
+
+        # モジュールレベルのセレクター定義を参照
+        self.selectors = _SELECTORS
+
+    def extract_products_from_page(self, driver, seen_urls=None) -> List[Dict[str, Any]]:
+        """現在のページから商品データを抽出
+
+        seen_urls に既出の商品URL集合を渡すと、重複商品は残りの
+        フィールド抽出に入る前にスキップされる。
+        """
         try:
             self.logger.info("ページから商品データを抽出中...")
-            
-            # ページソースを取得
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
+
+            # current_urlはCDPラウンドトリップを伴うため1ページ1回だけ取得
+            base_url = driver.current_url
+
+            # ページソースの取得もドライバーとの往復＋全文シリアライズを
+            # 伴うため1ページ1回だけ行い、各抽出経路で共有する
+            page_source = driver.page_source
+
+            # 最速パス: __NEXT_DATA__ に埋め込まれた商品JSONを直接読む
+            # （セレクター探索なしの1回のJSONデコードで全商品が揃う）
+            products = self._extract_products_from_next_data(
+                page_source, base_url, seen_urls)
+            if products:
+                self.logger.info(f"商品データ抽出完了 (__NEXT_DATA__): {len(products)}件")
+                return products
+
+            # CDP経由で全商品フィールドを一括取得（1回のラウンドトリップ）
+            raw_products = self._extract_products_via_cdp(driver)
+            if raw_products:
+                products = []
+                for i, raw in enumerate(raw_products):
+                    try:
+                        product_data = self._build_product_from_raw(raw, base_url, seen_urls)
+                        if product_data:
+                            products.append(product_data)
+                    except Exception as e:
+                        self.logger.warning(f"商品抽出エラー ({i+1}/{len(raw_products)}): {e}")
+                        continue
+
+                self.logger.info(f"商品データ抽出完了: {len(products)}件")
+                return products
+
+            # フォールバック: ページソースをlxmlでパースして抽出
+            # （lxmlはインポートが重いためフォールバック時のみ読み込む）
+            import lxml.html
+            tree = lxml.html.fromstring(page_source)
+
             # 商品要素を取得
-            product_elements = self._find_product_elements(driver, soup)
-            
+            product_elements = self._find_product_elements(tree)
+
             if not product_elements:
                 self.logger.warning("商品要素が見つかりませんでした")
                 return []
-            
+
             products = []
-            
+
             for i, element in enumerate(product_elements):
                 try:
-                    product_data = self._extract_single_product(element, soup, driver)
+                    if self._specialized is not None:
+                        # 検出済みレイアウトに特化した直線的な抽出
+                        product_data = self._extract_specialized(element, base_url, seen_urls)
+                    else:
+                        product_data = self._extract_single_product(element, tree, base_url, seen_urls)
+                        if product_data:
+                            # 初回成功時、ヒットしたセレクターで特化抽出器を構築
+                            self._specialized = self._build_specialized_extractor()
+
                     if product_data:
                         products.append(product_data)
                         self.logger.debug(f"商品抽出成功 ({i+1}/{len(product_elements)}): {product_data.get('title', 'N/A')[:30]}...")
-                    
-                    # レート制限対策
-                    if i % 10 == 9:
-                        time.sleep(0.5)
-                        
+
                 except Exception as e:
                     self.logger.warning(f"商品抽出エラー ({i+1}/{len(product_elements)}): {e}")
                     continue
-            
+
+            # 返すのは素のdictのみ。要素リストとツリーへの参照をここで
+            # 手放し、数十MBになり得るパース木をページ単位でGCさせる
+            del product_elements
+            del tree
+
             self.logger.info(f"商品データ抽出完了: {len(products)}件")
             return products
-            
+
         except Exception as e:
             self.logger.error(f"ページ商品抽出エラー: {e}")
             return []
-    
-    def _find_product_elements(self, driver, soup) -> List:
-        """商品要素を検索"""
-        # Selenium経由で検索
-        for selector in self.selectors['product_list']:
+
+    def _extract_products_via_cdp(self, driver) -> List[Dict[str, Any]]:
+        """CDP(Runtime.evaluate)で全商品のフィールドを一括抽出
+
+        WebDriverのfind_elementsはフィールド毎にJSON wireプロトコルを
+        往復するため、商品数×フィールド数分のIPCが発生する。
+        ページ内JSで全フィールドを抽出してJSONで一括返却することで
+        ラウンドトリップを1ページあたり1回に削減する。
+        """
+        expression = self._build_extraction_script()
+
+        try:
+            result = driver.execute_cdp_cmd('Runtime.evaluate', {
+                'expression': expression,
+                'returnByValue': True
+            })
+            value = result.get('result', {}).get('value')
+            if value:
+                raw_products = json.loads(value)
+                self.logger.debug(f"商品要素発見 (CDP): {len(raw_products)}件")
+                return raw_products
+        except Exception as e:
+            self.logger.debug(f"CDP抽出失敗（フォールバックへ移行）: {e}")
+
+        return []
+
+    def _build_extraction_script(self) -> str:
+        """商品フィールド一括抽出用のJS式を構築"""
+        selectors_json = json.dumps({
+            key: [s for s in values if ':contains(' not in s]
+            for key, values in self.selectors.items()
+        }, ensure_ascii=False)
+
+        return """
+        (function() {
+            var SEL = %s;
+            function pick(root, selectors) {
+                for (var i = 0; i < selectors.length; i++) {
+                    try {
+                        var el = root.querySelector(selectors[i]);
+                        if (el) return el;
+                    } catch (e) {}
+                }
+                return null;
+            }
+            var items = [];
+            for (var i = 0; i < SEL.product_list.length; i++) {
+                try {
+                    var found = document.querySelectorAll(SEL.product_list[i]);
+                    if (found.length) { items = Array.prototype.slice.call(found); break; }
+                } catch (e) {}
+            }
+            var results = [];
+            for (var i = 0; i < items.length; i++) {
+                var el = items[i];
+                var link = pick(el, SEL.product_link);
+                var title = pick(el, SEL.product_title);
+                var price = pick(el, SEL.product_price);
+                var img = pick(el, SEL.product_image);
+                var cond = pick(el, SEL.condition);
+                var like = pick(el, SEL.like_count);
+                results.push({
+                    url: link ? link.getAttribute('href') : null,
+                    title: title ? title.textContent : null,
+                    price_text: price ? price.textContent : null,
+                    image_url: img ? (img.getAttribute('src') || img.getAttribute('data-src')) : null,
+                    is_sold: !!pick(el, SEL.sold_badge),
+                    condition: cond ? cond.textContent : null,
+                    like_text: like ? like.textContent : null
+                });
+            }
+            return JSON.stringify(results);
+        })()
+        """ % selectors_json
+
+    def _build_product_from_raw(self, raw: Dict[str, Any], base_url: str,
+                                seen_urls=None) -> Optional[Dict[str, Any]]:
+        """CDPで取得した生フィールドから商品データを構築"""
+        # 商品URLを最初に確定し、既出商品なら残りの抽出を行わない
+        url = self._absolute_url(base_url, raw.get('url'))
+        if seen_urls is not None and url and url in seen_urls:
+            return None
+
+        product_data = {
+            'extracted_at': datetime.now().isoformat(),
+            'source_url': base_url,
+            'url': url,
+        }
+
+        # 商品タイトル
+        title = raw.get('title')
+        product_data['title'] = clean_text(title) if title else None
+
+        # 商品価格
+        price_text = raw.get('price_text')
+        product_data['price'] = _fast_price(price_text) if price_text else None
+
+        # 商品画像URL
+        image_url = raw.get('image_url')
+        product_data['image_url'] = self._absolute_url(base_url, image_url)
+
+        # 売り切れ状態
+        product_data['is_sold'] = bool(raw.get('is_sold'))
+
+        # 商品状態
+        condition = raw.get('condition')
+        product_data['condition'] = clean_text(condition) if condition else None
+
+        # いいね数
+        like_text = raw.get('like_text')
+        numbers = _DIGIT_RE.findall(like_text) if like_text else []
+        product_data['like_count'] = int(numbers[0]) if numbers else 0
+
+        # 商品ID生成（URLに本物の商品IDがあればそれを使う）
+        if product_data.get('title') and product_data.get('price'):
+            product_data['product_id'] = (
+                _product_id_from_url(product_data.get('url'))
+                or generate_product_id(product_data['title'], product_data['price'])
+            )
+
+        # キーワード抽出
+        if product_data.get('title'):
+            product_data['keywords'] = extract_keywords_from_title(product_data['title'])
+
+        # データ検証（タイトル必須＋価格の妥当性チェック）
+        price = product_data.get('price')
+        if product_data.get('title') and isinstance(price, int) and 0 < price <= 10000000:
+            return product_data
+
+        return None
+
+    def _extract_products_from_next_data(self, page_source: str, base_url: str,
+                                         seen_urls=None) -> List[Dict[str, Any]]:
+        """__NEXT_DATA__ の埋め込みJSONから商品リストを抽出
+
+        メルカリの検索ページはNext.js製で、商品配列がそのままJSONとして
+        埋め込まれている。DOM抽出（要素ごとに数十回のセレクター評価）の
+        代わりに、O(N)のJSONデコード1回で構造化フィールドを直接読む。
+        """
+        match = _NEXT_DATA_RE.search(page_source)
+        if not match:
+            return []
+
+        try:
+            payload = match.group(1)
+            data = orjson.loads(payload) if orjson is not None else json.loads(payload)
+        except Exception as e:
+            self.logger.debug(f"__NEXT_DATA__ パース失敗: {e}")
+            return []
+
+        item_list = self._find_next_data_items(data)
+        if not item_list:
+            return []
+
+        products = []
+        for item in item_list:
             try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    self.logger.debug(f"商品要素発見: {len(elements)}件 (セレクター: {selector})")
-                    return elements
-            except:
+                product_data = self._build_product_from_next_item(
+                    item, base_url, seen_urls)
+                if product_data:
+                    products.append(product_data)
+            except Exception as e:
+                self.logger.debug(f"__NEXT_DATA__ 商品変換エラー: {e}")
                 continue
-        
-        # BeautifulSoup経由で検索
+
+        return products
+
+    @staticmethod
+    def _find_next_data_items(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """__NEXT_DATA__ 内の商品配列を探す（複数スキーマ対応）"""
+        page_props = data.get('props', {}).get('pageProps', {})
+
+        # パターン1: pageProps.items
+        items = page_props.get('items')
+        if items:
+            return items
+
+        # パターン2: initialState.searchResult.itemGrid.items
+        items = (page_props.get('initialState', {})
+                 .get('searchResult', {})
+                 .get('itemGrid', {})
+                 .get('items'))
+        if items:
+            return items
+
+        # パターン3: initialState.entities.items（id→商品の辞書）
+        entities = (page_props.get('initialState', {})
+                    .get('entities', {})
+                    .get('items'))
+        if isinstance(entities, dict) and entities:
+            return list(entities.values())
+
+        return []
+
+    def _build_product_from_next_item(self, item: Dict[str, Any], base_url: str,
+                                      seen_urls=None) -> Optional[Dict[str, Any]]:
+        """__NEXT_DATA__ の商品エントリから商品データを構築"""
+        item_id = item.get('id') or item.get('itemId') or ''
+        url = f"https://jp.mercari.com/item/{item_id}" if item_id else None
+        if seen_urls is not None and url and url in seen_urls:
+            return None
+
+        title = item.get('name') or item.get('title')
+        price = item.get('price')
+        if isinstance(price, dict):
+            price = price.get('value')
+
+        thumbnails = item.get('thumbnails') or []
+        image_url = (thumbnails[0] if thumbnails else None) or item.get('thumbnailUrl')
+
+        product_data = {
+            'extracted_at': datetime.now().isoformat(),
+            'source_url': base_url,
+            'url': url,
+            'title': clean_text(title) if title else None,
+            'price': int(price) if price is not None else None,
+            'image_url': image_url,
+            'is_sold': item.get('status') in ('sold_out', 'trading'),
+            'condition': item.get('condition') or None,
+            'like_count': int(item.get('numLikes') or 0),
+        }
+
+        # 商品ID生成（URLに本物の商品IDがあればそれを使う）
+        if product_data.get('title') and product_data.get('price'):
+            product_data['product_id'] = (
+                _product_id_from_url(product_data.get('url'))
+                or generate_product_id(product_data['title'], product_data['price'])
+            )
+
+        # キーワード抽出
+        if product_data.get('title'):
+            product_data['keywords'] = extract_keywords_from_title(product_data['title'])
+
+        # データ検証（タイトル必須＋価格の妥当性チェック）
+        price = product_data.get('price')
+        if product_data.get('title') and isinstance(price, int) and 0 < price <= 10000000:
+            return product_data
+
+        return None
+
+    def _find_product_elements(self, tree) -> List:
+        """商品要素を検索（フォールバック用）
+
+        まずXPathユニオンで1回のDOM走査により全候補レイアウトを
+        同時に探索する。見つからない場合のみ従来の逐次セレクター
+        探索に戻る。
+        """
+        global _product_xpath
+        if _product_xpath is None:
+            from lxml import etree
+            _product_xpath = etree.XPath(_PRODUCT_XPATH_UNION)
+
+        try:
+            elements = _product_xpath(tree)
+        except Exception:
+            elements = []
+
+        if elements:
+            self.logger.debug(f"商品要素発見 (XPath): {len(elements)}件")
+            return elements
+
         for selector in self.selectors['product_list']:
-            elements = soup.select(selector)
+            try:
+                elements = tree.cssselect(selector)
+            except Exception:
+                # :contains() 等、cssselect非対応のセレクターはスキップ
+                continue
             if elements:
-                self.logger.debug(f"商品要素発見 (BS4): {len(elements)}件 (セレクター: {selector})")
+                self.logger.debug(f"商品要素発見 (lxml): {len(elements)}件 (セレクター: {selector})")
                 return elements
-        
+
         return []
     
-    def _extract_single_product(self, element, soup, driver) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _absolute_url(base_url: str, url: Optional[str]) -> Optional[str]:
+        """相対URLのみ絶対URLに変換（メルカリのhrefは大半が絶対URL）"""
+        if not url:
+            return None
+        if url.startswith('http'):
+            return url
+        return urljoin(base_url, url)
+
+    def _extract_single_product(self, element, tree, base_url: str,
+                                seen_urls=None) -> Optional[Dict[str, Any]]:
         """単一商品のデータ抽出"""
-        product_data = {
-            'extracted_at': datetime.now().isoformat(),
-            'source_url': driver.current_url
-        }
-        
         try:
-            # 商品URL
-            product_data['url'] = self._extract_product_url(element, driver)
-            
+            # 商品URLを最初に抽出し、既出商品なら残りの抽出をスキップ
+            url = self._extract_product_url(element, base_url)
+            if seen_urls is not None and url and url in seen_urls:
+                return None
+
+            # 要素全文は部分木の走査を伴うため1回だけ計算し、
+            # テキストフォールバックを使う抽出器で共有する
+            full_text = element.text_content()
+
+            product_data = {
+                'extracted_at': datetime.now().isoformat(),
+                'source_url': base_url,
+                'url': url,
+            }
+
             # 商品タイトル
             product_data['title'] = self._extract_product_title(element)
-            
+
             # 商品価格
-            product_data['price'] = self._extract_product_price(element)
-            
+            product_data['price'] = self._extract_product_price(element, full_text)
+
             # 商品画像URL
-            product_data['image_url'] = self._extract_product_image(element, driver)
-            
+            product_data['image_url'] = self._extract_product_image(element, base_url)
+
             # 売り切れ状態
-            product_data['is_sold'] = self._extract_sold_status(element)
+            product_data['is_sold'] = self._extract_sold_status(element, full_text)
             
             # 商品状態
             product_data['condition'] = self._extract_condition(element)
@@ -189,137 +669,283 @@ class ProductExtractor:
             # いいね数
             product_data['like_count'] = self._extract_like_count(element)
             
-            # 商品ID生成
+            # 商品ID生成（URLに本物の商品IDがあればそれを使う）
             if product_data.get('title') and product_data.get('price'):
-                product_data['product_id'] = generate_product_id(
-                    product_data['title'], 
-                    product_data['price']
+                product_data['product_id'] = (
+                    _product_id_from_url(product_data.get('url'))
+                    or generate_product_id(product_data['title'], product_data['price'])
                 )
             
             # キーワード抽出
             if product_data.get('title'):
                 product_data['keywords'] = extract_keywords_from_title(product_data['title'])
             
-            # データ検証
-            if self._validate_product_data(product_data):
+            # データ検証（タイトル必須＋価格の妥当性チェック）
+            price = product_data.get('price')
+            if product_data.get('title') and isinstance(price, int) and 0 < price <= 10000000:
                 return product_data
-            
+
         except Exception as e:
             self.logger.debug(f"単一商品抽出エラー: {e}")
         
         return None
     
-    def _extract_product_url(self, element, driver) -> Optional[str]:
+    def _extract_product_url(self, element, base_url: str) -> Optional[str]:
         """商品URLの抽出"""
-        for selector in self.selectors['product_link']:
+        for index, selector in enumerate(_get_compiled_selectors()['product_link']):
+            if selector is None:
+                continue
             try:
-                # Selenium経由
-                link_element = element.find_element(By.CSS_SELECTOR, selector)
-                href = link_element.get_attribute('href')
+                matches = selector(element)
+                if not matches:
+                    continue
+                href = matches[0].get('href')
                 if href:
-                    # 相対URLを絶対URLに変換
-                    return urljoin(driver.current_url, href)
+                    self._selector_hits['product_link'] = index
+                    return self._absolute_url(base_url, href)
             except:
                 continue
-        
+
         return None
-    
+
     def _extract_product_title(self, element) -> Optional[str]:
         """商品タイトルの抽出"""
-        for selector in self.selectors['product_title']:
+        for index, selector in enumerate(_get_compiled_selectors()['product_title']):
+            if selector is None:
+                continue
             try:
-                title_element = element.find_element(By.CSS_SELECTOR, selector)
-                title = title_element.get_attribute('textContent') or title_element.text
+                matches = selector(element)
+                if not matches:
+                    continue
+                title = matches[0].text_content()
                 if title:
+                    self._selector_hits['product_title'] = index
                     return clean_text(title)
             except:
                 continue
-        
+
         return None
-    
-    def _extract_product_price(self, element) -> Optional[int]:
+
+    def _extract_product_price(self, element, full_text: str = None) -> Optional[int]:
         """商品価格の抽出"""
-        for selector in self.selectors['product_price']:
+        for index, selector in enumerate(_get_compiled_selectors()['product_price']):
+            if selector is None:
+                continue
             try:
-                price_element = element.find_element(By.CSS_SELECTOR, selector)
-                price_text = price_element.get_attribute('textContent') or price_element.text
+                matches = selector(element)
+                if not matches:
+                    continue
+                price_text = matches[0].text_content()
                 if price_text:
-                    price = extract_price(price_text)
+                    price = _fast_price(price_text)
                     if price:
+                        self._selector_hits['product_price'] = index
                         return price
             except:
                 continue
-        
+
+        # フォールバック: キャッシュ済みの要素全文から価格を探す
+        if full_text:
+            return extract_price(full_text)
+
         return None
-    
-    def _extract_product_image(self, element, driver) -> Optional[str]:
-        """商品画像URLの抽出"""
-        for selector in self.selectors['product_image']:
+
+    def _extract_product_image(self, element, base_url: str) -> Optional[str]:
+        """商品画像URLの抽出
+
+        まず属性値を直接返すXPathユニオンで1回の走査を試し、
+        取れない場合のみセレクターの線形探索に戻る。
+        """
+        global _img_xpath
+        if _img_xpath is None:
+            from lxml import etree
+            _img_xpath = etree.XPath(_IMG_XPATH_UNION)
+
+        try:
+            for src in _img_xpath(element):
+                if src:
+                    # XPathの属性値はsmart stringで親要素を参照し続けるため、
+                    # 素のstrに写し取ってツリーを延命させない
+                    return self._absolute_url(base_url, str(src))
+        except Exception:
+            pass
+
+        for index, selector in enumerate(_get_compiled_selectors()['product_image']):
+            if selector is None:
+                continue
             try:
-                img_element = element.find_element(By.CSS_SELECTOR, selector)
-                src = img_element.get_attribute('src') or img_element.get_attribute('data-src')
+                matches = selector(element)
+                if not matches:
+                    continue
+                src = matches[0].get('src') or matches[0].get('data-src')
                 if src:
-                    return urljoin(driver.current_url, src)
+                    self._selector_hits['product_image'] = index
+                    return self._absolute_url(base_url, src)
             except:
                 continue
-        
+
         return None
-    
-    def _extract_sold_status(self, element) -> bool:
+
+    def _extract_sold_status(self, element, full_text: str = None) -> bool:
         """売り切れ状態の抽出"""
-        for selector in self.selectors['sold_badge']:
+        for index, selector in enumerate(_get_compiled_selectors()['sold_badge']):
+            if selector is None:
+                continue
             try:
-                element.find_element(By.CSS_SELECTOR, selector)
-                return True  # 売り切れバッジが見つかった
+                if selector(element):
+                    self._selector_hits['sold_badge'] = index
+                    return True  # 売り切れバッジが見つかった
             except:
                 continue
-        
+
+        # フォールバック: キャッシュ済みの要素全文でSOLD表記を探す
+        # （:contains() セレクターがcssselect非対応なため、その代替）
+        if full_text and _SOLD_RE.search(full_text):
+            return True
+
         return False
-    
+
     def _extract_condition(self, element) -> Optional[str]:
         """商品状態の抽出"""
-        for selector in self.selectors['condition']:
+        for index, selector in enumerate(_get_compiled_selectors()['condition']):
+            if selector is None:
+                continue
             try:
-                condition_element = element.find_element(By.CSS_SELECTOR, selector)
-                condition = condition_element.get_attribute('textContent') or condition_element.text
+                matches = selector(element)
+                if not matches:
+                    continue
+                condition = matches[0].text_content()
                 if condition:
+                    self._selector_hits['condition'] = index
                     return clean_text(condition)
             except:
                 continue
-        
+
         return None
-    
+
     def _extract_like_count(self, element) -> int:
         """いいね数の抽出"""
-        for selector in self.selectors['like_count']:
+        for index, selector in enumerate(_get_compiled_selectors()['like_count']):
+            if selector is None:
+                continue
             try:
-                like_element = element.find_element(By.CSS_SELECTOR, selector)
-                like_text = like_element.get_attribute('textContent') or like_element.text
+                matches = selector(element)
+                if not matches:
+                    continue
+                like_text = matches[0].text_content()
                 if like_text:
                     # 数字を抽出
-                    numbers = re.findall(r'\d+', like_text)
+                    numbers = _DIGIT_RE.findall(like_text)
                     if numbers:
+                        self._selector_hits['like_count'] = index
                         return int(numbers[0])
             except:
                 continue
-        
+
         return 0
-    
-    def _validate_product_data(self, product_data: Dict[str, Any]) -> bool:
-        """商品データの検証"""
-        required_fields = ['title', 'price']
-        
-        for field in required_fields:
-            if not product_data.get(field):
-                return False
-        
-        # 価格の妥当性チェック
+
+    def _build_specialized_extractor(self) -> Optional[Dict[str, Any]]:
+        """検出済みレイアウト用にセレクターを事前コンパイル
+
+        最初に抽出が成功した商品でヒットしたセレクターだけを
+        CSSSelectorとしてコンパイルして保持する。以降の商品は
+        フォールバックの線形探索を通らず直線的に抽出できる。
+        """
+        try:
+            compiled = _get_compiled_selectors()
+            return {
+                fieldname: compiled[fieldname][index]
+                for fieldname, index in self._selector_hits.items()
+                if compiled[fieldname][index] is not None
+            }
+        except Exception as e:
+            self.logger.debug(f"特化抽出器の構築失敗: {e}")
+            return None
+
+    def _extract_specialized(self, element, base_url: str,
+                             seen_urls=None) -> Optional[Dict[str, Any]]:
+        """特化抽出器による直線的な抽出"""
+        spec = self._specialized
+
+        def first(fieldname):
+            selector = spec.get(fieldname)
+            if selector is None:
+                return None
+            matches = selector(element)
+            return matches[0] if matches else None
+
+        link_element = first('product_link')
+        url = self._absolute_url(base_url, link_element.get('href')) if link_element is not None else None
+        if url is None:
+            # レイアウトが変わった可能性があるため汎用抽出に戻す
+            return self._extract_single_product(element, None, base_url, seen_urls)
+        if seen_urls is not None and url in seen_urls:
+            return None
+
+        product_data = {
+            'extracted_at': datetime.now().isoformat(),
+            'source_url': base_url,
+            'url': url,
+        }
+
+        title_element = first('product_title')
+        product_data['title'] = clean_text(title_element.text_content()) if title_element is not None else None
+
+        # 価格は初回商品がテキストフォールバック由来だとセレクターが
+        # 記録されないため、特化セレクターで取れない場合は汎用ヘルパー
+        # （要素全文フォールバック込み）で補完する
+        price_element = first('product_price')
+        if price_element is not None:
+            product_data['price'] = _fast_price(price_element.text_content())
+        else:
+            product_data['price'] = self._extract_product_price(
+                element, element.text_content())
+
+        image_element = first('product_image')
+        if image_element is not None:
+            src = image_element.get('src') or image_element.get('data-src')
+            product_data['image_url'] = self._absolute_url(base_url, src)
+        else:
+            # 特化セレクターが無い場合はXPathユニオン入りの汎用抽出で補完
+            product_data['image_url'] = self._extract_product_image(element, base_url)
+
+        # 任意フィールドは特化セレクターが無ければ汎用ヘルパーで補完
+        if 'sold_badge' in spec:
+            product_data['is_sold'] = bool(spec['sold_badge'](element))
+        else:
+            product_data['is_sold'] = self._extract_sold_status(element)
+
+        if 'condition' in spec:
+            condition_element = first('condition')
+            product_data['condition'] = clean_text(condition_element.text_content()) if condition_element is not None else None
+        else:
+            product_data['condition'] = self._extract_condition(element)
+
+        if 'like_count' in spec:
+            like_element = first('like_count')
+            numbers = _DIGIT_RE.findall(like_element.text_content()) if like_element is not None else []
+            product_data['like_count'] = int(numbers[0]) if numbers else 0
+        else:
+            product_data['like_count'] = self._extract_like_count(element)
+
+        # 商品ID生成（URLに本物の商品IDがあればそれを使う）
+        if product_data.get('title') and product_data.get('price'):
+            product_data['product_id'] = (
+                _product_id_from_url(product_data.get('url'))
+                or generate_product_id(product_data['title'], product_data['price'])
+            )
+
+        # キーワード抽出
+        if product_data.get('title'):
+            product_data['keywords'] = extract_keywords_from_title(product_data['title'])
+
+        # データ検証（タイトル必須＋価格の妥当性チェック）
         price = product_data.get('price')
-        if not isinstance(price, int) or price <= 0 or price > 10000000:
-            return False
-        
-        return True
+        if product_data.get('title') and isinstance(price, int) and 0 < price <= 10000000:
+            return product_data
 
+        return None
+    
 class MercariResearcher:
     """メルカリ商品リサーチクラス"""
     
@@ -329,88 +955,214 @@ class MercariResearcher:
         self.db = database
         self.logger = setup_logger(__name__)
         
-        # 商品抽出器
-        self.extractor = ProductExtractor()
-        
-        # エラーハンドラー
-        self.error_handler = MercariErrorHandler(config)
-        
+        # 商品抽出器とスロットリング期限はスレッドローカルに持つ。
+        # 並行一括検索の各ワーカーが、別スレッドのレイアウトで組まれた
+        # 特化抽出器を引いたり、他スレッドの待機期限に巻き込まれたり
+        # しないようにする（逐次実行ではメインスレッドの1組のみ）
+        self._local = threading.local()
+
+
+        # エラーハンドラー（core.error_handler未配備の環境ではNone）
+        self.error_handler = (
+            MercariErrorHandler(config) if MercariErrorHandler is not None
+            else None)
+
         # リトライ設定
-        self.retry_config = RetryConfig(
-            max_retries=self.config.get_int('system', 'max_retry_count', 3),
-            base_delay=self.config.get_float('system', 'request_interval', 2.0)
-        )
-    
+        if RetryConfig is not None:
+            self.retry_config = RetryConfig(
+                max_retries=self.config.get_int('system', 'max_retry_count', 3),
+                base_delay=self.config.get_float('system', 'request_interval', 2.0)
+            )
+        else:
+            self.retry_config = None
+
+        # 直接HTTP検索用のセッション（初回利用時に生成）
+        self._http_session = None
+
+    @property
+    def extractor(self):
+        """呼び出しスレッド専用のProductExtractorを返す"""
+        if not hasattr(self._local, 'extractor'):
+            self._local.extractor = ProductExtractor()
+        return self._local.extractor
+
+    @property
+    def _next_action_at(self):
+        """呼び出しスレッドのページ遷移スロットリング期限（monotonic時刻）"""
+        return getattr(self._local, 'next_action_at', 0.0)
+
+    @_next_action_at.setter
+    def _next_action_at(self, value):
+        self._local.next_action_at = value
+
+    def _get_http_session(self):
+        """keep-alive付きrequests.Sessionを遅延生成して使い回す"""
+        if self._http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': self.config.get(
+                    'system', 'user_agent',
+                    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'),
+                'Accept-Language': 'ja',
+            })
+
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=10,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504]
+                )
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+
+            self._http_session = session
+
+        return self._http_session
+
+    def search_products_api(self, keyword: str,
+                            max_products: int = None) -> List[Dict[str, Any]]:
+        """Seleniumを介さない直接HTTP検索
+
+        検索ページをkeep-aliveセッションで取得し、__NEXT_DATA__の
+        埋め込みJSONから商品を抽出する。Chromeの起動・レンダリングを
+        丸ごと省けるが、JS実行後にしか商品が現れないページでは空に
+        なるため、その場合は通常のsearch_productsへ切り替えること。
+        """
+        max_products = max_products or self.config.get_int(
+            'mercari', 'max_products_per_search', 50)
+
+        # 検索条件をクエリに反映（Seleniumパスのフィルターと同等）
+        params = {'keyword': keyword}
+        if self.config.get_boolean('mercari', 'search_sold_only', True):
+            params['status'] = 'sold_out'
+
+        min_price = self.config.get_int('mercari', 'min_price', 0)
+        max_price = self.config.get_int('mercari', 'max_price', 0)
+        if min_price:
+            params['price_min'] = min_price
+        if max_price:
+            params['price_max'] = max_price
+
+        url = f"https://jp.mercari.com/search?{urlencode(params)}"
+
+        session = self._get_http_session()
+        response = session.get(
+            url, timeout=self.config.get_int('system', 'timeout_seconds', 30))
+        response.raise_for_status()
+
+        products = self.extractor._extract_products_from_next_data(
+            response.text, 'https://jp.mercari.com', None)
+
+        if not products:
+            self.logger.warning(
+                "HTTP検索で商品が得られませんでした（JSレンダリングが必要な可能性）")
+            return []
+
+        products = products[:max_products]
+        self.logger.info(f"HTTP検索完了: {len(products)}件")
+        return products
+
+
     @retry_on_error()
-    def search_products(self, keyword: str, max_products: int = None) -> List[Dict[str, Any]]:
-        """商品検索とデータ抽出"""
+    def search_products(self, keyword: str, max_products: int = None,
+                        rpa=None) -> List[Dict[str, Any]]:
+        """商品検索とデータ抽出
+
+        rpa にセットアップ済みのMercariRPAセッションを渡すと、
+        ブラウザ起動を省略してそのセッション上で検索する
+        （batch_searchがキーワード間でブラウザを使い回すために利用）。
+        """
         try:
             self.logger.info(f"商品検索開始: {keyword}")
-            
+
             max_products = max_products or self.config.get_int('mercari', 'max_products_per_search', 50)
-            
+
+            if rpa is not None:
+                return self._search_with_rpa(rpa, keyword, max_products)
+
+            # Selenium一式を引き込むRPA基盤は検索実行時に初めてインポートする
+            from core.rpa import MercariRPA
+
             with MercariRPA(self.config) as rpa:
                 # WebDriverセットアップ
                 if not rpa.setup_driver():
                     raise Exception("WebDriverのセットアップに失敗しました")
-                
+
                 # メルカリにアクセス
                 if not rpa.navigate_to_mercari():
                     raise Exception("メルカリへのアクセスに失敗しました")
-                
-                # 検索フィルター設定
-                filters = {
-                    'sold_only': self.config.get_boolean('mercari', 'search_sold_only', True),
-                    'condition': self.config.get('mercari', 'search_condition', 'new'),
-                    'price_range': self._get_price_filter()
-                }
-                
-                # 検索実行
-                if not rpa.perform_search(keyword, filters):
-                    raise Exception(f"検索の実行に失敗しました: {keyword}")
-                
-                # 商品データを収集
-                all_products = []
-                page_count = 0
-                max_pages = self.config.get_int('mercari', 'max_pages', 5)
-                
-                while len(all_products) < max_products and page_count < max_pages:
-                    page_count += 1
-                    self.logger.info(f"ページ {page_count} の商品を抽出中...")
-                    
-                    # 全商品を読み込むためにスクロール
-                    rpa.scroll_to_load_all()
-                    
-                    # 商品データを抽出
-                    products = self.extractor.extract_products_from_page(rpa.driver)
-                    
-                    if not products:
-                        self.logger.warning(f"ページ {page_count} で商品が見つかりませんでした")
-                        break
-                    
-                    # 重複除去
-                    new_products = self._remove_duplicates(products, all_products)
-                    all_products.extend(new_products)
-                    
-                    self.logger.info(f"ページ {page_count} から {len(new_products)}件の新規商品を取得")
-                    
-                    # 次のページに進む
-                    if len(all_products) < max_products and page_count < max_pages:
-                        if not self._go_to_next_page(rpa):
-                            break
-                
-                # 結果を制限
-                final_products = all_products[:max_products]
-                
-                self.logger.info(f"商品検索完了: {len(final_products)}件取得")
-                return final_products
-                
+
+                return self._search_with_rpa(rpa, keyword, max_products)
+
         except Exception as e:
             self.logger.error(f"商品検索エラー: {e}")
             # エラーハンドリング
             context = {'keyword': keyword, 'function': 'search_products'}
-            self.error_handler.handle_error(e, context)
+            if self.error_handler is not None:
+                self.error_handler.handle_error(e, context)
             raise
+
+    def _search_with_rpa(self, rpa, keyword: str,
+                         max_products: int) -> List[Dict[str, Any]]:
+        """セットアップ済みRPAセッション上での検索本体"""
+        # 検索フィルター設定
+        filters = {
+            'sold_only': self.config.get_boolean('mercari', 'search_sold_only', True),
+            'condition': self.config.get('mercari', 'search_condition', 'new'),
+            'price_range': self._get_price_filter()
+        }
+
+        # 検索実行
+        if not rpa.perform_search(keyword, filters):
+            raise Exception(f"検索の実行に失敗しました: {keyword}")
+
+        # 商品データを収集
+        all_products = []
+        seen_urls = set()
+        page_count = 0
+        max_pages = self.config.get_int('mercari', 'max_pages', 5)
+
+        while len(all_products) < max_products and page_count < max_pages:
+            page_count += 1
+            self.logger.info(f"ページ {page_count} の商品を抽出中...")
+
+            # ページ遷移後のスロットリング期限まで残り時間だけ待機
+            self._wait_until_deadline()
+
+            # 全商品を読み込むためにスクロール
+            rpa.scroll_to_load_all()
+
+            # 商品データを抽出（既出URLは抽出ループ内でスキップされる）
+            new_products = self.extractor.extract_products_from_page(
+                rpa.driver, seen_urls)
+
+            if not new_products:
+                self.logger.warning(f"ページ {page_count} で商品が見つかりませんでした")
+                break
+
+            seen_urls.update(
+                p['url'] for p in new_products if p.get('url'))
+            all_products.extend(new_products)
+
+            self.logger.info(f"ページ {page_count} から {len(new_products)}件の新規商品を取得")
+
+            # 次のページに進む
+            if len(all_products) < max_products and page_count < max_pages:
+                if not self._go_to_next_page(rpa):
+                    break
+
+        # 結果を制限
+        final_products = all_products[:max_products]
+
+        self.logger.info(f"商品検索完了: {len(final_products)}件取得")
+        return final_products
     
     def _get_price_filter(self) -> Optional[Dict[str, int]]:
         """価格フィルターの取得"""
@@ -425,20 +1177,11 @@ class MercariResearcher:
         
         return None
     
-    def _remove_duplicates(self, new_products: List[Dict], existing_products: List[Dict]) -> List[Dict]:
-        """重複商品の除去"""
-        existing_urls = {p.get('url') for p in existing_products if p.get('url')}
-        
-        unique_products = []
-        for product in new_products:
-            if product.get('url') not in existing_urls:
-                unique_products.append(product)
-        
-        return unique_products
-    
-    def _go_to_next_page(self, rpa: MercariRPA) -> bool:
+    def _go_to_next_page(self, rpa: 'MercariRPA') -> bool:
         """次のページに移動"""
         try:
+            from selenium.webdriver.common.by import By
+
             # 次へボタンのセレクター
             next_selectors = [
                 '[data-testid="pagination-next"]',
@@ -452,95 +1195,178 @@ class MercariResearcher:
                     next_button = rpa.driver.find_element(By.CSS_SELECTOR, selector)
                     if next_button.is_enabled():
                         rpa.human.human_click(rpa.driver, next_button)
-                        time.sleep(random.uniform(2.0, 4.0))
+                        # その場でsleepせず期限だけ記録し、次の処理と待ちを重ねる
+                        self._next_action_at = time.monotonic() + random.uniform(2.0, 4.0)
                         return True
                 except:
                     continue
-            
+
             return False
-            
+
         except Exception as e:
             self.logger.warning(f"次ページ移動エラー: {e}")
             return False
+
+    def _wait_until_deadline(self):
+        """スロットリング期限までの残り時間だけ待機
+
+        ページ読み込みや抽出に時間がかかった場合は残りがゼロになる
+        ため、実質的に待たずに済む。
+        """
+        remaining = self._next_action_at - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
     
-    def save_products_to_csv(self, products: List[Dict[str, Any]], 
-                           filename: str = None) -> str:
-        """商品データをCSVファイルに保存"""
+    def save_products_to_csv(self, products: Iterable[Dict[str, Any]],
+                           filename: str = None,
+                           output_dir: str = None) -> str:
+        """商品データをCSVファイルに保存
+
+        products はリストに限らずイテレータも受け付け、行が届くたびに
+        書き出す。全件をメモリに抱えてから保存する必要がなく、検索と
+        書き込みを重ねられる。
+
+        output_dir を指定するとそのディレクトリへ書き出す（未指定は
+        results/日付）。テストでは/dev/shmのようなRAMバックのパスを
+        渡すとディスクIOなしで完結する。
+        """
         try:
-            if not products:
+            # 空かどうかは1件目を覗いて判定（イテレータを消費しないようchainで戻す)
+            products_iter = iter(products)
+            try:
+                first = next(products_iter)
+            except StopIteration:
                 self.logger.warning("保存する商品データがありません")
                 return None
-            
+            products_iter = chain([first], products_iter)
+
             # ファイル名の生成
             if filename is None:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"mercari_products_{timestamp}.csv"
-            
+
             # 保存ディレクトリの作成
-            csv_path = Path(f"results/{datetime.now().strftime('%Y-%m-%d')}")
+            if output_dir is not None:
+                csv_path = Path(output_dir)
+            else:
+                csv_path = Path(f"results/{datetime.now().strftime('%Y-%m-%d')}")
             csv_path.mkdir(parents=True, exist_ok=True)
-            
+
             full_path = csv_path / filename
-            
+
             # CSV列の定義
             fieldnames = [
                 'product_id', 'title', 'price', 'url', 'image_url',
                 'is_sold', 'condition', 'like_count', 'keywords',
                 'extracted_at', 'source_url'
             ]
-            
+
             # CSVファイルに書き込み
-            with open(full_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                # ヘッダー行
-                writer.writeheader()
-                
-                # データ行
-                for product in products:
+            # （DictWriterの行ごとのdict→リスト変換とキー検査を避け、
+            # 　列順を固定したリストをcsv.writerへ直接渡す）
+            saved_count = 0
+
+            def rows():
+                nonlocal saved_count
+                for product in products_iter:
                     # キーワードをカンマ区切り文字列に変換
-                    if isinstance(product.get('keywords'), list):
-                        product['keywords'] = ', '.join(product['keywords'])
-                    
-                    # 価格を通貨形式でフォーマット
-                    if product.get('price'):
-                        product['price_formatted'] = format_currency(product['price'])
-                    
-                    writer.writerow(product)
-            
-            self.logger.info(f"CSV保存完了: {full_path} ({len(products)}件)")
+                    keywords = product.get('keywords')
+                    if isinstance(keywords, list):
+                        keywords = ', '.join(keywords)
+
+                    yield [
+                        product.get('product_id', ''),
+                        product.get('title', ''),
+                        product.get('price', ''),
+                        product.get('url', ''),
+                        product.get('image_url', ''),
+                        product.get('is_sold', ''),
+                        product.get('condition', ''),
+                        product.get('like_count', ''),
+                        keywords or '',
+                        product.get('extracted_at', ''),
+                        product.get('source_url', ''),
+                    ]
+                    saved_count += 1
+
+            # 1MBバッファで行ごとのwriteシステムコールをまとめ、
+            # 行ループはwriterowsのC実装側で回す
+            with open(full_path, 'w', newline='', encoding='utf-8-sig',
+                      buffering=1 << 20) as csvfile:
+                writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
+                writer.writerow(fieldnames)
+                writer.writerows(rows())
+
+            self.logger.info(f"CSV保存完了: {full_path} ({saved_count}件)")
             return str(full_path)
-            
+
         except Exception as e:
             self.logger.error(f"CSV保存エラー: {e}")
             return None
-    
+
+    def save_products_to_feather(self, products: List[Dict[str, Any]],
+                                 filename: str = None) -> Optional[str]:
+        """商品データをFeatherファイルに保存
+
+        CSVは外部向けエクスポート用として残し、パイプライン内で
+        読み戻すデータは列指向で書き込み・パースともに速いFeatherを使う。
+        pandas/pyarrowが未導入の環境ではNoneを返してスキップする。
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            self.logger.warning("pandas未導入のためFeather保存をスキップします")
+            return None
+
+        try:
+            products = list(products)
+            if not products:
+                self.logger.warning("保存する商品データがありません")
+                return None
+
+            # ファイル名の生成
+            if filename is None:
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                filename = f"mercari_products_{timestamp}.feather"
+
+            # 保存ディレクトリの作成
+            out_dir = Path(f"results/{datetime.now().strftime('%Y-%m-%d')}")
+            out_dir.mkdir(parents=True, exist_ok=True)
+            full_path = out_dir / filename
+
+            df = pd.DataFrame(products)
+            df.to_feather(full_path, compression='zstd', compression_level=3)
+
+            self.logger.info(f"Feather保存完了: {full_path} ({len(df)}件)")
+            return str(full_path)
+
+        except Exception as e:
+            self.logger.error(f"Feather保存エラー: {e}")
+            return None
+
     def save_products_to_database(self, products: List[Dict[str, Any]]) -> int:
         """商品データをデータベースに保存"""
         try:
-            saved_count = 0
-            
-            for product in products:
-                try:
-                    # データベース形式に変換
-                    db_product = {
-                        'product_id': product.get('product_id'),
-                        'title': product.get('title'),
-                        'price': product.get('price'),
-                        'condition_text': product.get('condition'),
-                        'image_urls': json.dumps([product.get('image_url')]) if product.get('image_url') else None,
-                        'like_count': product.get('like_count', 0),
-                        'view_count': 0  # 初期値
-                    }
-                    
-                    # データベースに保存
-                    self.db.add_mercari_product(db_product)
-                    saved_count += 1
-                    
-                except Exception as e:
-                    self.logger.warning(f"商品DB保存エラー: {e}")
-                    continue
-            
+            # 列指向バッチに載せ替えてから行を生成（dict行の逐次参照を回避）
+            batch = ProductBatch.from_products(products)
+
+            rows = []
+            for row in batch.iter_db_rows():
+                # データベース形式に変換
+                # （orjsonが使える場合はシリアライズをRust実装に逃がす）
+                image_url = row.pop('image_url')
+                if not image_url:
+                    row['image_urls'] = None
+                elif orjson is not None:
+                    row['image_urls'] = orjson.dumps([image_url]).decode()
+                else:
+                    row['image_urls'] = json.dumps([image_url])
+                row['view_count'] = 0  # 初期値
+                rows.append(row)
+
+            # 1行ずつの自動コミットを避け、1トランザクションで一括保存
+            saved_count = self.db.add_mercari_products(rows)
+
             self.logger.info(f"データベース保存完了: {saved_count}件")
             return saved_count
             
@@ -549,19 +1375,72 @@ class MercariResearcher:
             return 0
     
     def batch_search(self, keywords: List[str]) -> Dict[str, Any]:
-        """複数キーワードでの一括検索"""
+        """複数キーワードでの一括検索
+
+        mercariセクションのparallel_workersを2以上にすると、キーワード
+        ごとに独立したブラウザセッションを立てて並行検索する。既定（1）は
+        1セッションを全キーワードで使い回す逐次実行。
+        """
         try:
             self.logger.info(f"一括検索開始: {len(keywords)}個のキーワード")
+
+            workers = self.config.get_int('mercari', 'parallel_workers', 1)
+
+            if workers > 1 and len(keywords) > 1:
+                all_products, search_results = self._batch_search_parallel(
+                    keywords, min(workers, len(keywords)))
+            else:
+                all_products, search_results = self._batch_search_sequential(
+                    keywords)
+
+            # 重複除去
+            unique_products = self._remove_duplicates_global(all_products)
             
-            all_products = []
-            search_results = {}
+            # 結果を保存
+            if unique_products:
+                csv_path = self.save_products_to_csv(unique_products)
+                db_count = self.save_products_to_database(unique_products)
+            else:
+                csv_path = None
+                db_count = 0
             
+            result = {
+                'total_products': len(unique_products),
+                'keywords_searched': len(keywords),
+                'csv_file': csv_path,
+                'database_saved': db_count,
+                'search_details': search_results,
+                'completed_at': datetime.now().isoformat()
+            }
+            
+            self.logger.info(f"一括検索完了: {result['total_products']}件の商品を収集")
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"一括検索エラー: {e}")
+            raise
+
+    def _batch_search_sequential(self, keywords: List[str]) -> Tuple[List[Dict], Dict[str, Any]]:
+        """1セッションを使い回す逐次一括検索"""
+        all_products = []
+        search_results = {}
+
+        # ブラウザのコールドスタートは1〜2秒かかるため、
+        # 1セッションを立ち上げて全キーワードで使い回す
+        from core.rpa import MercariRPA
+
+        with MercariRPA(self.config) as rpa:
+            if not rpa.setup_driver():
+                raise Exception("WebDriverのセットアップに失敗しました")
+            if not rpa.navigate_to_mercari():
+                raise Exception("メルカリへのアクセスに失敗しました")
+
             for i, keyword in enumerate(keywords, 1):
                 self.logger.info(f"検索進行 ({i}/{len(keywords)}): {keyword}")
-                
+
                 try:
-                    products = self.search_products(keyword)
-                    
+                    products = self.search_products(keyword, rpa=rpa)
+
                     if products:
                         all_products.extend(products)
                         search_results[keyword] = {
@@ -573,13 +1452,13 @@ class MercariResearcher:
                             'product_count': 0,
                             'status': 'no_results'
                         }
-                    
+
                     # 検索間隔の調整
                     if i < len(keywords):
                         interval = self.config.get_float('mercari', 'search_interval', 3.0)
                         self.logger.debug(f"次の検索まで {interval}秒 待機中...")
                         time.sleep(interval)
-                
+
                 except Exception as e:
                     self.logger.error(f"キーワード検索エラー ({keyword}): {e}")
                     search_results[keyword] = {
@@ -588,43 +1467,76 @@ class MercariResearcher:
                         'error': str(e)
                     }
                     continue
-            
-            # 重複除去
-            unique_products = self._remove_duplicates_global(all_products)
-            
-            # 結果を保存
-            if unique_products:
-                csv_path = self.save_products_to_csv(unique_products)
-                db_count = self.save_products_to_database(unique_products)
-            else:
-                csv_path = None
-                db_count = 0
-            
-            result = {
-                'total_products': len(unique_products),
-                'keywords_searched': len(keywords),
-                'csv_file': csv_path,
-                'database_saved': db_count,
-                'search_details': search_results,
-                'completed_at': datetime.now().isoformat()
+
+        return all_products, search_results
+
+    def _batch_search_parallel(self, keywords: List[str],
+                               workers: int) -> Tuple[List[Dict], Dict[str, Any]]:
+        """キーワードごとに独立セッションを立てる並行一括検索
+
+        検索はネットワーク待ちが支配的なため、セッション起動コストを
+        払ってもワーカー数分のリクエスト待ちを重ねられる方が速い。
+        ドライバ・抽出器・スロットリング期限はスレッド間で共有しない。
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from core.rpa import MercariRPA
+
+        all_products = []
+        search_results = {}
+        interval = self.config.get_float('mercari', 'search_interval', 3.0)
+
+        def search_one(keyword):
+            with MercariRPA(self.config) as rpa:
+                if not rpa.setup_driver():
+                    raise Exception("WebDriverのセットアップに失敗しました")
+                if not rpa.navigate_to_mercari():
+                    raise Exception("メルカリへのアクセスに失敗しました")
+                products = self.search_products(keyword, rpa=rpa)
+
+            # 検索間隔はワーカー単位で空け、全体のアクセス頻度を抑える
+            time.sleep(interval)
+            return products
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(search_one, keyword): keyword
+                for keyword in keywords
             }
-            
-            self.logger.info(f"一括検索完了: {result['total_products']}件の商品を収集")
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"一括検索エラー: {e}")
-            raise
-    
+
+            for future in as_completed(futures):
+                keyword = futures[future]
+                try:
+                    products = future.result()
+
+                    if products:
+                        all_products.extend(products)
+                        search_results[keyword] = {
+                            'product_count': len(products),
+                            'status': 'success'
+                        }
+                    else:
+                        search_results[keyword] = {
+                            'product_count': 0,
+                            'status': 'no_results'
+                        }
+
+                except Exception as e:
+                    self.logger.error(f"キーワード検索エラー ({keyword}): {e}")
+                    search_results[keyword] = {
+                        'product_count': 0,
+                        'status': 'error',
+                        'error': str(e)
+                    }
+
+        return all_products, search_results
+
     def _remove_duplicates_global(self, products: List[Dict]) -> List[Dict]:
         """グローバル重複除去"""
-        seen_urls = set()
-        unique_products = []
-        
-        for product in products:
-            url = product.get('url')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_products.append(product)
-        
-        return unique_products
\ No newline at end of file
+        # URL列だけを先に取り出し、挿入順を保つdictで一意なURL→行番号を構築
+        urls = [product.get('url') for product in products]
+        first_seen = {}
+        for index, url in enumerate(urls):
+            if url and url not in first_seen:
+                first_seen[url] = index
+
+        return [products[index] for index in first_seen.values()]
\ No newline at end of file
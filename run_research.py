@@ -3,6 +3,7 @@
 メルカリリサーチ機能の実行サンプル
 実際に商品データを収集してCSVに保存します
 """
+import re
 import sys
 from pathlib import Path
 
@@ -10,15 +11,25 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# キーワード入力の区切り（半角・全角カンマと前後の空白をまとめて処理）
+_KEYWORD_SPLIT_RE = re.compile(r'\s*[,、]\s*')
+
 def single_keyword_research():
     """単一キーワードでのリサーチ"""
+    print("🔍 単一キーワードリサーチ")
+    print("=" * 40)
+
+    # キーワード入力
+    # （重いモジュールの読み込みは入力が確定してから行う）
+    keyword = input("検索キーワードを入力してください: ")
+    if not keyword.strip():
+        print("❌ キーワードが入力されませんでした")
+        return False
+
     from core.config import Config
     from core.database import Database
     from modules.research import MercariResearcher
-    
-    print("🔍 単一キーワードリサーチ")
-    print("=" * 40)
-    
+
     # 設定
     config = Config()
     
@@ -33,13 +44,7 @@ def single_keyword_research():
     
     # リサーチャー
     researcher = MercariResearcher(config, db)
-    
-    # キーワード入力
-    keyword = input("検索キーワードを入力してください: ")
-    if not keyword.strip():
-        print("❌ キーワードが入力されませんでした")
-        return False
-    
+
     try:
         print(f"\n🚀 リサーチ開始: {keyword}")
         print("ブラウザが起動します...")
@@ -82,13 +87,29 @@ def single_keyword_research():
 
 def multi_keyword_research():
     """複数キーワードでのリサーチ"""
+    print("\n🔍 複数キーワード一括リサーチ")
+    print("=" * 40)
+
+    # キーワード入力
+    # （重いモジュールの読み込みは入力が確定してから行う）
+    print("検索キーワードをカンマ区切りで入力してください")
+    print("例: iPhone,iPad,MacBook")
+    keywords_input = input("キーワード: ")
+
+    if not keywords_input.strip():
+        print("❌ キーワードが入力されませんでした")
+        return False
+
+    keywords = [kw for kw in _KEYWORD_SPLIT_RE.split(keywords_input.strip()) if kw]
+
+    if not keywords:
+        print("❌ 有効なキーワードがありません")
+        return False
+
     from core.config import Config
     from core.database import Database
     from modules.research import MercariResearcher
-    
-    print("\n🔍 複数キーワード一括リサーチ")
-    print("=" * 40)
-    
+
     # 設定
     config = Config()
     config.set('system', 'headless', 'false')
@@ -100,22 +121,7 @@ def multi_keyword_research():
     
     # リサーチャー
     researcher = MercariResearcher(config, db)
-    
-    # キーワード入力
-    print("検索キーワードをカンマ区切りで入力してください")
-    print("例: iPhone,iPad,MacBook")
-    keywords_input = input("キーワード: ")
-    
-    if not keywords_input.strip():
-        print("❌ キーワードが入力されませんでした")
-        return False
-    
-    keywords = [kw.strip() for kw in keywords_input.split(',') if kw.strip()]
-    
-    if not keywords:
-        print("❌ 有効なキーワードがありません")
-        return False
-    
+
     try:
         print(f"\n🚀 一括リサーチ開始: {keywords}")
         print("※ 複数のキーワードで検索するため時間がかかります")
@@ -141,6 +147,67 @@ def multi_keyword_research():
         print(f"❌ エラーが発生しました: {e}")
         return False
 
+def run_from_stdin():
+    """非対話実行（標準入力がパイプ/リダイレクトの場合）
+
+    対話モードは確認・メニュー・キーワードと複数回のinput()を挟むため
+    スクリプトからの一括起動に向かない。JSONフォームを1回の
+    sys.stdin.read()で受け取り、確認プロンプトなしで実行する。
+
+    例: echo '{"keywords": ["iPhone", "iPad"], "max_products": 10}' | python run_research.py
+    """
+    import json
+
+    try:
+        form = json.loads(sys.stdin.read())
+    except json.JSONDecodeError as e:
+        print(f"❌ 標準入力のJSONを解析できません: {e}")
+        return False
+
+    keywords = form.get('keywords') or (
+        [form['keyword']] if form.get('keyword') else [])
+    keywords = [str(kw).strip() for kw in keywords if str(kw).strip()]
+
+    if not keywords:
+        print("❌ keyword / keywords が指定されていません")
+        return False
+
+    from core.config import Config
+    from core.database import Database
+    from modules.research import MercariResearcher
+
+    # 自動実行では画面表示は不要なためヘッドレスを既定とする
+    config = Config()
+    config.set('system', 'headless', str(form.get('headless', True)).lower())
+    if 'max_products' in form:
+        config.set('mercari', 'max_products_per_search', str(form['max_products']))
+
+    db = Database()
+    researcher = MercariResearcher(config, db)
+
+    try:
+        if len(keywords) == 1:
+            print(f"🚀 リサーチ開始: {keywords[0]}")
+            products = researcher.search_products(keywords[0])
+            if not products:
+                print("❌ 商品が見つかりませんでした")
+                return False
+
+            csv_path = researcher.save_products_to_csv(products)
+            db_count = researcher.save_products_to_database(products)
+            print(f"✅ 検索完了: {len(products)}件 / CSV: {csv_path} / DB: {db_count}件")
+            return True
+
+        print(f"🚀 一括リサーチ開始: {keywords}")
+        results = researcher.batch_search(keywords)
+        print(f"✅ 一括リサーチ完了: {results['total_products']}件 / "
+              f"CSV: {results['csv_file']} / DB: {results['database_saved']}件")
+        return True
+
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        return False
+
 def main():
     """メイン実行"""
     print("🛒 メルカリリサーチツール")
@@ -182,6 +249,10 @@ def main():
     return success
 
 if __name__ == "__main__":
+    # パイプ/リダイレクト経由ならJSONフォームによる非対話実行へ
+    if not sys.stdin.isatty():
+        sys.exit(0 if run_from_stdin() else 1)
+
     print("⚠️  実行前の確認:")
     print("  ✓ Google Chrome がインストールされている")
     print("  ✓ インターネットに接続されている")
@@ -4,6 +4,8 @@
 必要なディレクトリとファイルを自動作成します
 """
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def create_directory_structure():
@@ -41,34 +43,50 @@ def create_directory_structure():
         'tests'
     ]
     
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
-        print(f"  ✅ {directory}")
-    
-    print("✅ ディレクトリ構造の作成完了")
+    # 親ディレクトリはos.makedirsが末端と同時に作るため、
+    # 他のパスの接頭辞になっていない末端ディレクトリだけを1パスで作成する
+    leaf_dirs = sorted(
+        d for d in set(directories)
+        if not any(other != d and other.startswith(d + '/') for other in directories)
+    )
 
-def create_init_files():
-    """__init__.pyファイルの作成"""
-    print("📄 __init__.pyファイルを作成中...")
-    
+    messages = []
+    for directory in leaf_dirs:
+        os.makedirs(directory, exist_ok=True)
+        messages.append(f"  ✅ {directory}")
+
+    # 1行ごとのprint（エンコード＋ロック＋書き込み）を避け、フェーズで1回だけ出力
+    messages.append(f"✅ ディレクトリ構造の作成完了 ({len(directories)}ディレクトリ)")
+    sys.stdout.write('\n'.join(messages) + '\n')
+
+def _scan_names(directory='.'):
+    """ディレクトリ内のエントリ名集合を1回のscandirで取得"""
+    try:
+        return {entry.name for entry in os.scandir(directory)}
+    except FileNotFoundError:
+        return set()
+
+def _init_file_tasks():
+    """__init__.pyファイルの作成タスクを収集"""
     init_files = [
         'modules/__init__.py',
         'tests/__init__.py'
     ]
-    
-    for init_file in init_files:
-        file_path = Path(init_file)
-        if not file_path.exists():
-            file_path.write_text('# -*- coding: utf-8 -*-\n')
-            print(f"  ✅ {init_file}")
-    
-    print("✅ __init__.pyファイルの作成完了")
 
-def create_gitignore():
-    """gitignoreファイルの作成"""
-    print("🚫 .gitignoreファイルを作成中...")
-    
-    gitignore_content = """# Python
+    # ファイルごとのstatではなく、親ディレクトリ単位の一覧で存在確認する
+    existing = {
+        str(parent / name)
+        for parent in {Path(f).parent for f in init_files}
+        for name in _scan_names(parent)
+    }
+
+    return [
+        (init_file, '# -*- coding: utf-8 -*-\n')
+        for init_file in init_files
+        if init_file not in existing
+    ]
+
+_GITIGNORE_CONTENT = """# Python
 __pycache__/
 *.py[cod]
 *$py.class
@@ -137,14 +155,9 @@ data/models/*.pkl
 *.pem
 credentials.json
 """
-    
-    Path('.gitignore').write_text(gitignore_content.strip())
-    print("✅ .gitignoreファイルの作成完了")
 
-def create_gitkeep_files():
-    """空ディレクトリ用の.gitkeepファイルを作成"""
-    print("📌 .gitkeepファイルを作成中...")
-    
+def _gitkeep_tasks():
+    """空ディレクトリ用の.gitkeep作成タスクを収集"""
     gitkeep_dirs = [
         'data/images/mercari',
         'data/images/alibaba',
@@ -157,39 +170,98 @@ def create_gitkeep_files():
         'results',
         'tests'
     ]
-    
-    for directory in gitkeep_dirs:
-        gitkeep_path = Path(directory) / '.gitkeep'
-        gitkeep_path.write_text('')
-        print(f"  ✅ {gitkeep_path}")
-    
-    print("✅ .gitkeepファイルの作成完了")
+
+    return [(f"{directory}/.gitkeep", '') for directory in gitkeep_dirs]
+
+# core.config.Config が生成するものと同じデフォルト設定。
+# セットアップ時にcoreパッケージ（暗号化・DB・ロガー）を
+# インポートせずに直接書き出すための複製。
+_DEFAULT_CONFIG_INI = """
+[system]
+# システム全般設定
+request_interval = 2.0
+max_retry_count = 3
+timeout_seconds = 30
+working_hours_start = 09:00
+working_hours_end = 23:00
+headless = false
+proxy =
+user_agent = Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36
+
+[mercari]
+# メルカリ設定
+email = MERCARI_EMAIL_ENCRYPTED
+password = MERCARI_PASSWORD_ENCRYPTED
+search_interval = 3.0
+max_products_per_search = 50
+max_pages = 5
+image_quality_threshold = 0.7
+search_sold_only = true
+search_condition = new
+min_price =
+max_price =
+
+[alibaba]
+# アリババ設定
+search_interval = 2.5
+exchange_rate = 21.0
+min_order_quantity = 1
+max_order_quantity = 50
+
+[business]
+# ビジネス設定
+min_profit_rate = 0.30
+max_investment = 50000
+initial_order_quantity = 3
+shipping_cost = 300
+mercari_fee_rate = 0.10
+
+[listing]
+# 出品設定
+auto_listing = true
+interval_minutes = 30
+max_listings_per_day = 10
+default_shipping_method = らくらくメルカリ便
+
+[database]
+# データベース設定
+backup_interval_days = 7
+max_backup_files = 30
+
+[logging]
+# ログ設定
+level = INFO
+max_file_size_mb = 10
+backup_count = 5
+
+[debug]
+# デバッグ設定
+verbose_errors = false
+save_screenshots = true
+save_page_source = false
+"""
 
 def create_config_ini():
     """デフォルトconfig.iniの作成"""
     print("⚙️  config.iniファイルを作成中...")
-    
-    if Path('config.ini').exists():
+
+    if 'config.ini' in _scan_names():
         print("  ℹ️  config.iniは既に存在します")
         return
-    
-    # Configクラスを使用してデフォルト設定を作成
-    try:
-        from core.config import Config
-        config = Config()
-        print("✅ config.iniファイルの作成完了")
-    except ImportError:
-        print("  ⚠️  core.configモジュールが見つかりません")
+
+    Path('config.ini').write_text(_DEFAULT_CONFIG_INI.strip(), encoding='utf-8')
+    print("✅ config.iniファイルの作成完了")
 
 def create_env_file():
     """.envファイルの作成"""
     print("🔐 .envファイルを作成中...")
     
-    if Path('.env').exists():
+    names = _scan_names()
+    if '.env' in names:
         print("  ℹ️  .envファイルは既に存在します")
         return
-    
-    if Path('.env.template').exists():
+
+    if '.env.template' in names:
         import shutil
         shutil.copy('.env.template', '.env')
         print("✅ .env.templateから.envを作成しました")
@@ -197,20 +269,15 @@ def create_env_file():
     else:
         print("  ⚠️  .env.templateが見つかりません")
 
-def create_batch_files():
-    """Windowsバッチファイルの作成"""
-    print("🔧 バッチファイルを作成中...")
-    
+def _batch_file_tasks():
+    """Windowsバッチファイルの作成タスクを収集"""
     # テスト実行用バッチ
     test_bat = """@echo off
 echo テスト実行中...
 python test_setup.py
 pause
 """
-    
-    Path('test.bat').write_text(test_bat)
-    print("  ✅ test.bat")
-    
+
     # 環境構築用バッチ
     install_bat = """@echo off
 echo 環境構築を開始します...
@@ -230,11 +297,35 @@ playwright install chromium
 echo 環境構築完了！
 pause
 """
-    
-    Path('install.bat').write_text(install_bat)
-    print("  ✅ install.bat")
-    
-    print("✅ バッチファイルの作成完了")
+
+    return [('test.bat', test_bat), ('install.bat', install_bat)]
+
+def create_static_files():
+    """各種ファイル（__init__.py / .gitignore / .gitkeep / バッチ）の一括作成
+
+    各フェーズは互いにデータ依存がないI/Oバウンド処理のため、
+    (パス, 内容) のタスクを集めてスレッドプールで並列に書き出す。
+    """
+    print("📄 各種ファイルを作成中...")
+
+    tasks = [
+        *_init_file_tasks(),
+        ('.gitignore', _GITIGNORE_CONTENT.strip()),
+        *_gitkeep_tasks(),
+        *_batch_file_tasks(),
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        messages = [f"  ✅ {path}" for path in
+                    executor.map(lambda task: _write_file(*task), tasks)]
+
+    messages.append(f"✅ ファイルの作成完了 ({len(tasks)}ファイル)")
+    sys.stdout.write('\n'.join(messages) + '\n')
+
+def _write_file(path, content):
+    """1ファイルを書き出してパスを返す（並列書き込み用ワーカー）"""
+    Path(path).write_text(content)
+    return path
 
 def show_next_steps():
     """次のステップを表示"""
@@ -268,13 +359,10 @@ def main():
     
     try:
         create_directory_structure()
-        create_init_files()
-        create_gitignore()
-        create_gitkeep_files()
+        create_static_files()
         create_config_ini()
         create_env_file()
-        create_batch_files()
-        
+
         show_next_steps()
         
     except Exception as e:
@@ -11,13 +11,73 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# インポートはモジュール読み込み時の1回だけ行う
+# （関数内importはキャッシュ済みでも呼び出しごとにsys.modules参照が走る）。
+# 依存不足の環境でもテストごとの結果とサマリーまでは表示したいので、
+# ここでは落とさず失敗を控えておき、各テスト内で報告する
+_IMPORT_ERROR = None
+try:
+    from core.config import Config
+    from core.database import Database
+    from modules.research import ProductExtractor, MercariResearcher
+except Exception as e:  # 依存欠如はImportError以外で現れることもある
+    _IMPORT_ERROR = e
+
+def _require_imports():
+    """モジュール読み込み時のインポート失敗を呼び出し元テストで報告させる"""
+    if _IMPORT_ERROR is not None:
+        raise _IMPORT_ERROR
+
+# Config（INI読み込み）とDatabase（接続＋スキーマ初期化）はテストごとに
+# 作り直さず、最初のテストで1回だけ構築して全テストで使い回す
+_shared_context = None
+
+def _get_shared_context():
+    """テスト間で共有するConfig/Databaseを返す"""
+    global _shared_context
+    _require_imports()
+    if _shared_context is None:
+        # インメモリDBならディスクIOもWALジャーナルも発生しない
+        _shared_context = (Config(), Database(':memory:'))
+    return _shared_context
+
+# CSV/DB保存テストで共有するサンプル商品。テストごとにdictリテラルを
+# 組み直さず、各テストは浅いコピーを取って使う
+_SAMPLE_PRODUCTS = (
+    {
+        'product_id': 'test_001',
+        'title': 'テスト商品1',
+        'price': 1500,
+        'url': 'https://jp.mercari.com/item/test1',
+        'image_url': 'https://example.com/image1.jpg',
+        'is_sold': True,
+        'condition': '新品・未使用',
+        'like_count': 10,
+        'keywords': ['テスト', '商品'],
+        'extracted_at': '2024-01-01T12:00:00',
+        'source_url': 'https://jp.mercari.com/search'
+    },
+    {
+        'product_id': 'test_002',
+        'title': 'テスト商品2',
+        'price': 2500,
+        'url': 'https://jp.mercari.com/item/test2',
+        'image_url': 'https://example.com/image2.jpg',
+        'is_sold': False,
+        'condition': '目立った傷や汚れなし',
+        'like_count': 5,
+        'keywords': ['テスト', '商品2'],
+        'extracted_at': '2024-01-01T12:01:00',
+        'source_url': 'https://jp.mercari.com/search'
+    }
+)
+
 def test_product_extractor():
     """商品抽出器のテスト"""
     print("=== 商品抽出器テスト ===")
     
     try:
-        from modules.research import ProductExtractor
-        
+        _require_imports()
         extractor = ProductExtractor()
         print("✅ ProductExtractor インスタンス作成成功")
         
@@ -36,13 +96,8 @@ def test_mercari_researcher_init():
     print("\n=== メルカリリサーチャー初期化テスト ===")
     
     try:
-        from core.config import Config
-        from core.database import Database
-        from modules.research import MercariResearcher
-        
-        config = Config()
-        db = Database('data/test_research.db')
-        
+        config, db = _get_shared_context()
+
         researcher = MercariResearcher(config, db)
         print("✅ MercariResearcher インスタンス作成成功")
         
@@ -60,58 +115,46 @@ def test_csv_save_function():
     print("\n=== CSV保存機能テスト ===")
     
     try:
-        from core.config import Config
-        from core.database import Database
-        from modules.research import MercariResearcher
-        
-        config = Config()
-        db = Database('data/test_research.db')
+        config, db = _get_shared_context()
         researcher = MercariResearcher(config, db)
         
-        # テスト用商品データ
-        test_products = [
-            {
-                'product_id': 'test_001',
-                'title': 'テスト商品1',
-                'price': 1500,
-                'url': 'https://jp.mercari.com/item/test1',
-                'image_url': 'https://example.com/image1.jpg',
-                'is_sold': True,
-                'condition': '新品・未使用',
-                'like_count': 10,
-                'keywords': ['テスト', '商品'],
-                'extracted_at': '2024-01-01T12:00:00',
-                'source_url': 'https://jp.mercari.com/search'
-            },
-            {
-                'product_id': 'test_002',
-                'title': 'テスト商品2',
-                'price': 2500,
-                'url': 'https://jp.mercari.com/item/test2',
-                'image_url': 'https://example.com/image2.jpg',
-                'is_sold': False,
-                'condition': '目立った傷や汚れなし',
-                'like_count': 5,
-                'keywords': ['テスト', '商品2'],
-                'extracted_at': '2024-01-01T12:01:00',
-                'source_url': 'https://jp.mercari.com/search'
-            }
-        ]
-        
+        # テスト用商品データ（共有サンプルの浅いコピー）
+        test_products = [dict(product) for product in _SAMPLE_PRODUCTS]
+
         # CSV保存テスト
-        csv_path = researcher.save_products_to_csv(test_products, 'test_products.csv')
+        # （/dev/shmがあればRAMバックのパスに書き、ディスクIOを省く）
+        shm = Path('/dev/shm')
+        output_dir = str(shm / 'merukari_test') if shm.is_dir() else None
+
+        csv_path = researcher.save_products_to_csv(
+            test_products, 'test_products.csv', output_dir=output_dir)
         
         if csv_path and Path(csv_path).exists():
             print(f"✅ CSV保存成功: {csv_path}")
-            
+
             # ファイルサイズ確認
             file_size = Path(csv_path).stat().st_size
             print(f"✅ ファイルサイズ: {file_size}バイト")
-            
-            return True
         else:
             print("❌ CSVファイルが作成されませんでした")
             return False
+
+        # Feather保存テスト（pandas/pyarrow導入時のみ）
+        feather_path = researcher.save_products_to_feather(
+            test_products, 'test_products.feather')
+
+        if feather_path:
+            import pandas as pd
+            restored = pd.read_feather(feather_path).to_dict('records')
+            if len(restored) == len(test_products):
+                print(f"✅ Feather保存・読み戻し成功: {feather_path}")
+            else:
+                print(f"❌ Feather読み戻し件数が不一致: {len(restored)}件")
+                return False
+        else:
+            print("ℹ️  Feather保存はスキップされました（pandas未導入）")
+
+        return True
         
     except Exception as e:
         print(f"❌ CSV保存テストエラー: {e}")
@@ -122,35 +165,62 @@ def test_database_save_function():
     print("\n=== データベース保存機能テスト ===")
     
     try:
-        from core.config import Config
-        from core.database import Database
-        from modules.research import MercariResearcher
-        
-        config = Config()
-        db = Database('data/test_research.db')
+        config, db = _get_shared_context()
         researcher = MercariResearcher(config, db)
         
-        # テスト用商品データ
-        test_products = [
-            {
-                'product_id': 'db_test_001',
-                'title': 'DB テスト商品1',
-                'price': 3000,
-                'condition': '新品・未使用',
-                'image_url': 'https://example.com/db_image1.jpg',
-                'like_count': 15
-            }
-        ]
-        
-        # データベース保存テスト
+        # テスト用商品データ（共有サンプルの浅いコピーをDB用に調整）
+        test_products = [dict(_SAMPLE_PRODUCTS[0], product_id='db_test_001')]
+
+        # データベース保存テスト（内部は一括APIで1トランザクション保存）
         saved_count = researcher.save_products_to_database(test_products)
-        
+
         if saved_count > 0:
             print(f"✅ データベース保存成功: {saved_count}件")
-            return True
         else:
             print("❌ データベース保存に失敗しました")
             return False
+
+        # 一括APIの直接呼び出しテスト
+        bulk_count = db.add_mercari_products([
+            {
+                'product_id': 'db_test_002',
+                'title': 'DB テスト商品2',
+                'price': 4500,
+                'condition_text': '目立った傷や汚れなし',
+                'image_urls': ['https://example.com/db_image2.jpg'],
+                'like_count': 8
+            },
+            {
+                'product_id': 'db_test_003',
+                'title': 'DB テスト商品3',
+                'price': 1200,
+                'condition_text': '新品・未使用',
+                'image_urls': [],
+                'like_count': 0
+            }
+        ])
+
+        if bulk_count == 2:
+            print(f"✅ 一括保存成功: {bulk_count}件")
+        else:
+            print(f"❌ 一括保存に失敗しました: {bulk_count}件")
+            return False
+
+        # バルクロードテスト（インデックスを外して一括投入→再構築）
+        bulk_products = [
+            dict(_SAMPLE_PRODUCTS[0], product_id=f'bulk_{i:04d}')
+            for i in range(500)
+        ]
+
+        with db.bulk_load():
+            loaded = researcher.save_products_to_database(bulk_products)
+
+        if loaded == len(bulk_products):
+            print(f"✅ バルクロード成功: {loaded}件")
+            return True
+        else:
+            print(f"❌ バルクロードに失敗しました: {loaded}件")
+            return False
         
     except Exception as e:
         print(f"❌ データベース保存テストエラー: {e}")
@@ -161,24 +231,38 @@ def test_search_simulation():
     print("\n=== 検索機能シミュレーションテスト ===")
     
     try:
-        from core.config import Config
-        from core.database import Database
-        from modules.research import MercariResearcher
-        
-        config = Config()
-        
+        config, db = _get_shared_context()
+
         # テスト用の設定
         config.set('system', 'headless', 'true')  # ヘッドレスモード
         config.set('mercari', 'max_products_per_search', '5')  # 少数での実行
-        
-        db = Database('data/test_research.db')
+
         researcher = MercariResearcher(config, db)
         
         print("設定完了。実際の検索テストを実行しますか？")
         print("（注意: インターネット接続とGoogle Chromeが必要です）")
-        
-        response = input("実行する場合は 'y' を入力: ")
-        
+        print("（'api' を入力するとChromeなしの直接HTTP検索を試します）")
+
+        response = input("実行する場合は 'y' または 'api' を入力: ")
+
+        if response.lower() == 'api':
+            try:
+                start = time.perf_counter()
+                products = researcher.search_products_api("iPhone", max_products=3)
+                elapsed = time.perf_counter() - start
+
+                if products:
+                    print(f"✅ HTTP検索テスト成功: {len(products)}件 ({elapsed:.2f}秒)")
+                    return True
+
+                print("ℹ️  HTTP検索で商品が得られませんでした"
+                      "（JSレンダリングが必要な可能性）")
+                return True
+
+            except Exception as e:
+                print(f"❌ HTTP検索実行エラー: {e}")
+                return False
+
         if response.lower() == 'y':
             try:
                 print("検索テスト開始...")
@@ -221,16 +305,11 @@ def test_batch_search_simulation():
     print("\n=== 一括検索シミュレーションテスト ===")
     
     try:
-        from core.config import Config
-        from core.database import Database
-        from modules.research import MercariResearcher
-        
-        config = Config()
+        config, db = _get_shared_context()
         config.set('system', 'headless', 'true')
         config.set('mercari', 'max_products_per_search', '2')  # 非常に少数
         config.set('mercari', 'search_interval', '2.0')  # 短い間隔
-        
-        db = Database('data/test_research.db')
+
         researcher = MercariResearcher(config, db)
         
         print("一括検索のシミュレーションテストを実行しますか？")
@@ -323,7 +402,7 @@ def main():
         print("")
         print("📁 生成されたファイルを確認してください:")
         print("  - results/ フォルダ内のCSVファイル")
-        print("  - data/test_research.db （テスト用データベース）")
+        print("  （テスト用データベースはインメモリのため残りません）")
         return True
     else:
         print("⚠️  一部のテストが失敗しました。")
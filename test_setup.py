@@ -5,53 +5,70 @@
 """
 import sys
 import os
+import time
 from pathlib import Path
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# インポートはモジュール読み込み時の1回だけ行う
+# （test_importsはimportlib経由で個別確認するため関数内のまま）。
+# このスクリプトは環境診断も兼ねるため、依存不足（cryptography等）でも
+# ここでは落とさず失敗を控えておき、各テスト内で報告する
+_IMPORT_ERROR = None
+try:
+    from core.config import Config
+    from core.database import Database
+    from core.logger import setup_logger, PerformanceLogger
+    from core.utils import (
+        clean_text, extract_price, extract_prices, calculate_profit,
+        calculate_profits, generate_product_id, validate_url, format_currency
+    )
+except Exception as e:  # 依存欠如はImportError以外で現れることもある
+    _IMPORT_ERROR = e
+
+def _require_imports():
+    """モジュール読み込み時のインポート失敗を呼び出し元テストで報告させる"""
+    if _IMPORT_ERROR is not None:
+        raise _IMPORT_ERROR
+
 def test_imports():
     """モジュールのインポートテスト"""
     print("=== モジュールインポートテスト ===")
-    
-    try:
-        from core.config import Config
-        print("✅ Config クラスのインポート成功")
-    except ImportError as e:
-        print(f"❌ Config クラスのインポート失敗: {e}")
-        return False
-    
-    try:
-        from core.logger import setup_logger, PerformanceLogger
-        print("✅ Logger モジュールのインポート成功")
-    except ImportError as e:
-        print(f"❌ Logger モジュールのインポート失敗: {e}")
-        return False
-    
-    try:
-        from core.database import Database
-        print("✅ Database クラスのインポート成功")
-    except ImportError as e:
-        print(f"❌ Database クラスのインポート失敗: {e}")
-        return False
-    
-    try:
-        from core.utils import clean_text, extract_price, calculate_profit
-        print("✅ Utils モジュールのインポート成功")
-    except ImportError as e:
-        print(f"❌ Utils モジュールのインポート失敗: {e}")
-        return False
-    
-    return True
+
+    import importlib
+    from concurrent.futures import ThreadPoolExecutor
+
+    modules = ['core.config', 'core.logger', 'core.database', 'core.utils']
+
+    # インポート機構はディスク読み込み中にGILを解放するため、
+    # 独立した4モジュールの読み込みをスレッドで重ねる
+    success = True
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            name: executor.submit(importlib.import_module, name)
+            for name in modules
+        }
+        for name, future in futures.items():
+            try:
+                future.result()
+                print(f"✅ {name} のインポート成功")
+            except Exception as e:
+                # 親パッケージのインポート失敗は兄弟スレッド側で
+                # ImportError以外の例外として現れることがある
+                print(f"❌ {name} のインポート失敗: {e}")
+                success = False
+
+    return success
 
 def test_config():
     """設定管理のテスト"""
     print("\n=== 設定管理テスト ===")
     
     try:
-        from core.config import Config
-        
+        _require_imports()
+
         # 設定インスタンスの作成
         config = Config()
         print("✅ Config インスタンスの作成成功")
@@ -85,8 +102,8 @@ def test_logger():
     print("\n=== ログ機能テスト ===")
     
     try:
-        from core.logger import setup_logger, PerformanceLogger
-        
+        _require_imports()
+
         # ロガーの作成
         logger = setup_logger('test_logger')
         print("✅ Logger インスタンスの作成成功")
@@ -100,7 +117,6 @@ def test_logger():
         # パフォーマンスロガーのテスト
         perf_logger = PerformanceLogger('test_performance')
         perf_logger.start_timer('test_operation')
-        import time
         time.sleep(0.1)
         duration = perf_logger.end_timer('test_operation')
         
@@ -121,10 +137,11 @@ def test_database():
     print("\n=== データベース機能テスト ===")
     
     try:
-        from core.database import Database
-        
+        _require_imports()
+
         # データベースインスタンスの作成
-        db = Database('data/test_database.db')
+        # （インメモリDBならディスクIOもWALジャーナルも発生しない）
+        db = Database(':memory:')
         print("✅ Database インスタンスの作成成功")
         
         # テスト用メルカリ商品データ
@@ -148,7 +165,15 @@ def test_database():
         # キーワードの追加
         keyword_id = db.add_keyword('テストキーワード', 'テストカテゴリ', 1)
         print(f"✅ キーワード追加成功: ID={keyword_id}")
-        
+
+        # キーワードの一括追加（executemany＋1トランザクション）
+        bulk_rows = [(f'一括キーワード{i}', 'テストカテゴリ', 1)
+                     for i in range(1000)]
+        start = time.perf_counter()
+        bulk_count = db.add_keywords(bulk_rows)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"✅ キーワード一括追加成功: {bulk_count}件 ({elapsed_ms:.1f}ms)")
+
         # アクティブキーワードの取得
         keywords = db.get_active_keywords(5)
         print(f"✅ キーワード取得成功: {len(keywords)}件")
@@ -157,11 +182,10 @@ def test_database():
         stats = db.get_statistics()
         print(f"✅ 統計情報取得成功: {stats}")
         
-        # テストデータのクリーンアップ
-        import os
-        os.remove('data/test_database.db')
-        print("✅ テストデータベース削除成功")
-        
+        # インメモリDBは接続を閉じれば消えるためファイル削除は不要
+        db.close()
+        print("✅ テストデータベースクリーンアップ成功")
+
         return True
         
     except Exception as e:
@@ -173,11 +197,8 @@ def test_utils():
     print("\n=== ユーティリティ機能テスト ===")
     
     try:
-        from core.utils import (
-            clean_text, extract_price, calculate_profit,
-            generate_product_id, validate_url, format_currency
-        )
-        
+        _require_imports()
+
         # テキストクリーニング
         dirty_text = "  <p>テスト　テキスト</p>  "
         clean = clean_text(dirty_text)
@@ -232,7 +253,23 @@ def test_utils():
             print("✅ 通貨フォーマット成功")
         else:
             print(f"❌ 通貨フォーマット失敗: {formatted} != ¥1,500")
-        
+
+        # 一括利益計算（ベクトル化版）
+        batch = calculate_profits([2000, 3000], [1000, 1500],
+                                  shipping_costs=300, mercari_fee_rate=0.10)
+        profits = list(batch['profit'])
+        if profits == [500, 900]:
+            print("✅ 一括利益計算成功")
+        else:
+            print(f"❌ 一括利益計算失敗: {profits} != [500, 900]")
+
+        # 一括価格抽出（ベクトル化版）
+        prices = extract_prices(["￥1,500", "2,000円", "送料無料"])
+        if prices[:2] == [1500, 2000] and prices[2] is None:
+            print("✅ 一括価格抽出成功")
+        else:
+            print(f"❌ 一括価格抽出失敗: {prices}")
+
         return True
         
     except Exception as e:
@@ -249,18 +286,20 @@ def test_directory_structure():
         'logs',
         'results'
     ]
-    
+
     success = True
-    
+
+    # パスごとのstatではなく、ディレクトリ単位の一覧で存在を確認する
+    present = {entry.name for entry in os.scandir('.')}
+
     for dir_name in required_dirs:
-        dir_path = Path(dir_name)
-        if dir_path.exists():
+        if dir_name in present:
             print(f"✅ ディレクトリ存在確認: {dir_name}")
         else:
             # ディレクトリを作成
-            dir_path.mkdir(parents=True, exist_ok=True)
+            Path(dir_name).mkdir(parents=True, exist_ok=True)
             print(f"✅ ディレクトリ作成: {dir_name}")
-    
+
     required_files = [
         'requirements.txt',
         'core/__init__.py',
@@ -269,15 +308,26 @@ def test_directory_structure():
         'core/database.py',
         'core/utils.py'
     ]
-    
+
+    # 親ディレクトリごとに1回だけscandirし、以降はset参照で確認する
+    listings = {'.': present}
+
     for file_name in required_files:
-        file_path = Path(file_name)
-        if file_path.exists():
+        parent, _, name = file_name.rpartition('/')
+        parent = parent or '.'
+
+        if parent not in listings:
+            try:
+                listings[parent] = {entry.name for entry in os.scandir(parent)}
+            except FileNotFoundError:
+                listings[parent] = set()
+
+        if name in listings[parent]:
             print(f"✅ ファイル存在確認: {file_name}")
         else:
             print(f"❌ ファイル不足: {file_name}")
             success = False
-    
+
     return success
 
 def main():